@@ -30,26 +30,43 @@ v20: Capacity-Constrained Ricardian Model restructuring.
 
 import csv
 import pathlib
+import re
 import sys
 import io
 import copy
+import functools
+import heapq
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
+import numpy as np
 from lxml import etree
 from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.shared import Emu, Pt, Inches, RGBColor
+from docx.oxml.ns import nsdecls, qn
+from docx.oxml import OxmlElement, parse_xml
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from docx.oxml.table import CT_Tbl
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 DOCS = pathlib.Path(r"F:\onedrive\__documents\papers\FLOPsExport\Documents")
 DATA = pathlib.Path(r"F:\onedrive\__documents\papers\FLOPsExport\Data")
 
+# Model inputs read by main()
+CAL_CSV = DATA / "calibration_results_v3.csv"
+REGIMES_CSV = DATA / "calibration_regimes_v3.csv"
+RELIABILITY_CSV = DATA / "reliability_index.csv"
+DC_CAPACITY_CSV = DATA / "dc_capacity_estimates.csv"
+GRID_CAPACITY_CSV = DATA / "grid_capacity_estimates.csv"
+LATENCY_CSV = DATA / "country_pair_latency.csv"
+
 TAU = 0.0008
 LAMBDA = 0.10
 PHI = 1.08
@@ -95,30 +112,192 @@ SUBSIDY_ADJ = {
 }
 
 
-def recompute_costs(cal, gpu_price=None, gpu_util=None,
+def read_iso_column(path, col, cast=float):
+    """Read one column of an iso3-keyed CSV into {iso3: cast(value)}.
+
+    Casts while parsing instead of building a dict per row first.
+    """
+    with open(path, encoding="utf-8") as f:
+        rows = csv.reader(f)
+        header = next(rows)
+        i_iso = header.index("iso3")
+        i_col = header.index(col)
+        # Blank lines come through as [], which DictReader would have skipped
+        return {row[i_iso]: cast(row[i_col]) for row in rows if row}
+
+
+def read_rows(path):
+    """Read a CSV into a list of row dicts."""
+    with open(path, encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def read_dc_capacity(path):
+    """Read data center capacity estimates.
+
+    Returns ({iso3: n_datacenters}, {iso3: capacity_mw}, {iso3: source}).
+    """
+    dc_counts = {}
+    dc_capacity = {}
+    dc_sources = {}
+    with open(path, encoding="utf-8") as f:
+        rows = csv.reader(f)
+        header = next(rows)
+        i_iso = header.index("iso3")
+        i_n = header.index("n_datacenters")
+        i_mw = header.index("capacity_mw")
+        i_src = header.index("source")
+        for row in rows:
+            if not row:  # blank line (DictReader skipped these)
+                continue
+            iso = row[i_iso]
+            dc_counts[iso] = int(row[i_n])
+            dc_capacity[iso] = float(row[i_mw])
+            dc_sources[iso] = row[i_src]
+    return dc_counts, dc_capacity, dc_sources
+
+
+def read_latency(path):
+    """Read bilateral average latency into {(iso3_from, iso3_to): ms}."""
+    with open(path, encoding="utf-8") as f:
+        rows = csv.reader(f)
+        header = next(rows)
+        i_from = header.index("iso3_from")
+        i_to = header.index("iso3_to")
+        i_ms = header.index("avg_ms")
+        # Blank lines come through as [], which DictReader would have skipped
+        return {(row[i_from], row[i_to]): float(row[i_ms]) for row in rows if row}
+
+
+def load_inputs():
+    """Read all main() inputs concurrently (overlaps file I/O on synced drives)."""
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        futs = {
+            "cal": ex.submit(read_rows, CAL_CSV),
+            "reg": ex.submit(read_rows, REGIMES_CSV),
+            "xi": ex.submit(read_iso_column, RELIABILITY_CSV, "xi_reliability"),
+            "dc": ex.submit(read_dc_capacity, DC_CAPACITY_CSV),
+            "k_bar": ex.submit(read_iso_column, GRID_CAPACITY_CSV, "K_bar_gpu_hours"),
+            "latency": ex.submit(read_latency, LATENCY_CSV),
+        }
+        return {name: fut.result() for name, fut in futs.items()}
+
+
+def cost_inputs(cal):
+    """Column arrays of the cost primitives in ``cal`` for recompute_costs.
+
+    Not persisted to disk: building them takes well under a millisecond,
+    less than checking and unpickling an on-disk cache would.
+    """
+    get = itemgetter("p_E_usd_kwh", "theta_summer_C", "c_j_construction")
+    prims = np.array([tuple(map(float, get(row))) for row in cal]).reshape(-1, 3)
+    arrs = {
+        "iso": [row["iso3"] for row in cal],
+        "p_E": np.ascontiguousarray(prims[:, 0]),
+        "theta": np.ascontiguousarray(prims[:, 1]),
+        "c_constr": np.ascontiguousarray(prims[:, 2]),
+    }
+    arrs["pue"] = PHI + DELTA_PUE * np.maximum(0, arrs["theta"] - THETA_REF)
+    return arrs
+
+
+def recompute_costs(arrs, gpu_price=None, gpu_util=None,
                     p_E_delta=0.0, pue_cap=None, subsidy_adj=None):
-    """Re-derive c_j from CSV primitives with parameter overrides."""
-    gp = gpu_price or GPU_PRICE
-    gu = gpu_util or GPU_UTIL
-    rho = gp / (GPU_LIFE * H_YR * gu)
-    costs = {}
-    for row in cal:
-        iso = row["iso3"]
-        p_E = float(row["p_E_usd_kwh"])
-        if subsidy_adj and iso in subsidy_adj:
-            p_E = subsidy_adj[iso]
-        p_E += p_E_delta
-        theta = float(row["theta_summer_C"])
-        pue = PHI + DELTA_PUE * max(0, theta - THETA_REF)
-        if pue_cap is not None:
-            pue = min(pue, pue_cap)
-        c_elec = pue * GAMMA * p_E
-        c_constr = float(row["c_j_construction"])
-        costs[iso] = c_elec + rho + ETA + c_constr
-    return costs
-
-
-def run_sensitivity(cal, omega, dc_k, k_bar, sanctioned):
+    """Re-derive c_j from the cost_inputs() arrays with parameter overrides."""
+    rho = (gpu_price or GPU_PRICE) / (GPU_LIFE * H_YR * (gpu_util or GPU_UTIL))
+    isos = arrs["iso"]
+    p_E = arrs["p_E"]
+    if subsidy_adj:
+        p_E = np.array([subsidy_adj.get(iso, p) for iso, p in zip(isos, p_E.tolist(), strict=True)])
+    p_E = p_E + p_E_delta
+    pue = arrs["pue"]
+    if pue_cap is not None:
+        pue = np.minimum(pue, pue_cap)
+    c_elec = pue * GAMMA * p_E
+    costs = c_elec + rho + ETA + arrs["c_constr"]
+    return dict(zip(isos, costs.tolist(), strict=True))
+
+
+def _solve_training(stack_c, stack_k, sanct_mask, dc_cost, dc_demand, lam=0.0):
+    """Capacity-constrained training equilibrium on array inputs.
+
+    The supply stack comes as parallel arrays sorted by cost. ``dc_cost``
+    holds each priced demand country's own cost and
+    ``dc_demand`` its training demand ALPHA * omega * Q_TOTAL; a country
+    imports when its cost exceeds (1 + lam) * p_T. Returns (p_T, alloc),
+    where alloc[i] is the quantity placed with the i-th non-sanctioned
+    supplier (a prefix of the eligible stack).
+    """
+    eligible = ~np.asarray(sanct_mask, dtype=bool)
+    elig_c = np.asarray(stack_c, dtype=float)[eligible]
+    elig_k_alpha = np.asarray(stack_k, dtype=float)[eligible] * ALPHA
+    # Stack is cost-sorted, so cumulative capacity is monotone: the marginal
+    # supplier for a given Q_TX is a binary search away.
+    cum = np.cumsum(elig_k_alpha)
+    p_T = stack_c[0]
+    for _ in range(30):
+        Q_TX = sum(dc_demand[dc_cost > (1 + lam) * p_T].tolist())
+        idx = int(np.searchsorted(cum, Q_TX))
+        if Q_TX <= 0 or idx == len(cum):
+            # No marginal supplier: p_T (and so Q_TX) cannot change on later
+            # iterations, so this is already the fixed point
+            break
+        p_T_new = float(elig_c[idx])
+        if abs(p_T_new - p_T) < 0.0001:
+            p_T = p_T_new
+            break
+        p_T = p_T_new
+    # Allocate Q_TX down the stack of suppliers priced at or below p_T;
+    # subtract.accumulate keeps the sequential remaining-demand arithmetic
+    ka = elig_k_alpha[:int(np.searchsorted(elig_c, p_T, side='right'))]
+    rems = np.subtract.accumulate(np.concatenate(([Q_TX], ka)))[:-1]
+    marginal = np.flatnonzero(ka >= rems)
+    if marginal.size:
+        j = int(marginal[0])
+        alloc = np.append(ka[:j], rems[j])
+    else:
+        alloc = ka
+    return p_T, alloc
+
+
+def _solve_mini(stack_c, stack_k, sanct_mask, dc_cost, dc_demand):
+    """Training price, exporter count and HHI_T for one sensitivity scenario."""
+    p_T, alloc = _solve_training(stack_c, stack_k, sanct_mask, dc_cost, dc_demand)
+    shares = alloc[alloc > 0].tolist()
+    total_exp = sum(shares)
+    hhi = sum((s / total_exp) ** 2 for s in shares) if total_exp > 0 else 1.0
+    return p_T, len(shares), hhi
+
+
+def _run_scenario(cost_arrs, kwargs, k_bar, sanctioned, dc_isos, dc_demand):
+    """Costs, ranking and training equilibrium for one sensitivity scenario.
+
+    Returns (rank_map, top5, p_T, n_exporters, hhi_T). Scenarios share no
+    state, but each takes only milliseconds, so run_sensitivity calls this
+    serially; a process pool would spend longer re-importing this module
+    (python-docx, NumPy) in its workers than the whole sweep takes.
+    """
+    costs_s = recompute_costs(cost_arrs, subsidy_adj=SUBSIDY_ADJ, **kwargs)
+    isos = list(costs_s)
+    c_arr = np.fromiter(costs_s.values(), dtype=float, count=len(isos))
+    # One stable sort serves both the ranking and the supply stack
+    order = np.argsort(c_arr, kind='stable').tolist()
+    iso_sorted = [isos[i] for i in order]
+    c_sorted = c_arr[order].tolist()
+    rank_map = {iso: r for r, iso in enumerate(iso_sorted, 1)}
+    top5 = iso_sorted[:5]
+
+    # Supply stack: countries with grid capacity data, in cost order
+    stack = [(iso, c) for iso, c in zip(iso_sorted, c_sorted, strict=True) if iso in k_bar]
+    stack_iso = [iso for iso, _ in stack]
+    p_T, n_exp, hhi = _solve_mini(
+        [c for _, c in stack], [k_bar[iso] for iso in stack_iso],
+        [iso in sanctioned for iso in stack_iso],
+        np.fromiter((costs_s[iso] for iso in dc_isos), dtype=float, count=len(dc_isos)), dc_demand)
+    return rank_map, top5, p_T, n_exp, hhi
+
+
+def run_sensitivity(cost_arrs, omega, dc_k, k_bar, sanctioned):
     """Run sensitivity analysis across parameter scenarios.
 
     Returns list of scenario result dicts with rankings, equilibrium
@@ -133,82 +312,42 @@ def run_sensitivity(cal, omega, dc_k, k_bar, sanctioned):
         ("Cooling efficiency cap (PUE \u2264 1.20)",     {"pue_cap": 1.20}),
     ]
 
-    def _solve_mini(supply_stack_s, costs_s):
-        """Standalone capacity-constrained training equilibrium solver."""
-        p_T = supply_stack_s[0][1]
-        for _ in range(30):
-            Q_TX = 0
-            for iso in dc_k:
-                if iso in costs_s:
-                    if costs_s[iso] > p_T:
-                        Q_TX += ALPHA * omega.get(iso, 0) * Q_TOTAL
-            cum_cap = 0
-            found = False
-            p_T_new = p_T
-            for iso_j, c_j, k_j in supply_stack_s:
-                if iso_j in sanctioned:
-                    continue
-                cum_cap += k_j * ALPHA
-                if cum_cap >= Q_TX and Q_TX > 0:
-                    p_T_new = c_j
-                    found = True
-                    break
-            if found and abs(p_T_new - p_T) < 0.0001:
-                p_T = p_T_new
-                break
-            if found:
-                p_T = p_T_new
-        # Count exporters and HHI
-        shares = {}
-        remaining = Q_TX
-        for iso_j, c_j, k_j in supply_stack_s:
-            if iso_j in sanctioned:
-                continue
-            if c_j > p_T:
-                break
-            ca = min(k_j * ALPHA, remaining)
-            if ca > 0:
-                shares[iso_j] = ca
-                remaining -= ca
-            if remaining <= 0:
-                break
-        total_exp = sum(shares.values())
-        hhi = sum((s / total_exp) ** 2 for s in shares.values()) if total_exp > 0 else 1.0
-        return p_T, len(shares), hhi
-
-    def _spearman(rank_a, rank_b, isos):
-        """Spearman rank correlation between two ranking dicts."""
-        n = len(isos)
+    def _spearman(ranks_a, ranks_b):
+        """Spearman rank correlation between two aligned rank arrays."""
+        n = len(ranks_a)
         if n < 2:
             return 1.0
-        d_sq = sum((rank_a[iso] - rank_b[iso]) ** 2 for iso in isos)
+        d_sq = int(((ranks_a - ranks_b) ** 2).sum())
         return 1 - 6 * d_sq / (n * (n ** 2 - 1))
 
+    # Demand side is scenario-invariant: encode it once
+    # Only countries with a cost can import; every scenario prices the same set
+    priced = set(cost_arrs["iso"])
+    dc_isos = [iso for iso in dc_k if iso in priced]
+    dc_demand = np.array([ALPHA * omega.get(iso, 0) * Q_TOTAL for iso in dc_isos])
+
     # Run all scenarios
     results = []
     baseline_rank = None
     baseline_top5 = None
 
     for label, kwargs in scenarios:
-        costs_s = recompute_costs(cal, subsidy_adj=SUBSIDY_ADJ, **kwargs)
-        ranked = sorted(costs_s.items(), key=lambda x: x[1])
-        rank_map = {iso: r for r, (iso, _) in enumerate(ranked, 1)}
-        top5 = [iso for iso, _ in ranked[:5]]
-
-        # Build supply stack
-        stack = sorted(
-            [(iso, costs_s[iso], k_bar.get(iso, 1e12))
-             for iso in costs_s if iso in k_bar],
-            key=lambda x: x[1]
-        )
-        p_T, n_exp, hhi = _solve_mini(stack, costs_s)
+        rank_map, top5, p_T, n_exp, hhi = _run_scenario(
+            cost_arrs, kwargs, k_bar, sanctioned, dc_isos, dc_demand)
 
         if baseline_rank is None:
             baseline_rank = rank_map
             baseline_top5 = top5
+            common_order = list(baseline_rank)
+            baseline_ranks_arr = np.fromiter(baseline_rank.values(), dtype=np.int64)
 
-        common = set(rank_map) & set(baseline_rank)
-        rho_s = _spearman(rank_map, baseline_rank, common)
+        if rank_map.keys() == baseline_rank.keys():
+            ranks_arr = np.fromiter((rank_map[iso] for iso in common_order), dtype=np.int64)
+            rho_s = _spearman(ranks_arr, baseline_ranks_arr)
+        else:
+            common = [iso for iso in common_order if iso in rank_map]
+            rho_s = _spearman(np.fromiter((rank_map[iso] for iso in common), dtype=np.int64),
+                              np.fromiter((baseline_rank[iso] for iso in common), dtype=np.int64))
         top5_match = (top5 == baseline_top5)
 
         result = {
@@ -249,6 +388,11 @@ TIMES_NEW_ROMAN = 'Times New Roman'
 HEADING_BLUE = RGBColor(0x2F, 0x54, 0x96)
 LINK_COLOR = '1F3864'
 
+# Lengths (Length is an immutable int subclass, so instances are shared)
+_PT_0, _PT_2, _PT_3, _PT_4, _PT_6, _PT_7_5, _PT_8, _PT_10, _PT_12, _PT_16 = (
+    Pt(x) for x in (0, 2, 3, 4, 6, 7.5, 8, 10, 12, 16))
+_IN_0, _IN_HALF, _IN_1 = Inches(0), Inches(0.5), Inches(1)
+
 # XML namespaces
 XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
 SPACE_PRESERVE = 'preserve'
@@ -260,18 +404,49 @@ TABLE_WIDTH_PCT = '5000'
 # OMML HELPERS
 # ═══════════════════════════════════════════════════════════════════════
 
+# Clark-notation tags/attributes used in hot loops (qn() is a dict lookup + format)
+_Q_M_VAL = qn('m:val')
+_Q_W_ASCII = qn('w:ascii')
+_Q_W_HANSI = qn('w:hAnsi')
+_Q_W_P = qn('w:p')
+_Q_W_PPR = qn('w:pPr')
+_Q_W_PSTYLE = qn('w:pStyle')
+_Q_W_SECTPR = qn('w:sectPr')
+_Q_W_R = qn('w:r')
+_Q_W_T = qn('w:t')
+_Q_W_T_ALL = f'.//{_Q_W_T}'
+_Q_W_RPR = qn('w:rPr')
+_Q_W_VAL = qn('w:val')
+_Q_W_ID = qn('w:id')
+_Q_W_NAME = qn('w:name')
+_Q_W_ANCHOR = qn('w:anchor')
+_Q_W_HISTORY = qn('w:history')
+_Q_W_TBLPR = qn('w:tblPr')
+_Q_W_TBLW = qn('w:tblW')
+_Q_W_TBLBORDERS = qn('w:tblBorders')
+_Q_W_TR = qn('w:tr')
+_Q_W_TC = qn('w:tc')
+_Q_W_HYPERLINK = qn('w:hyperlink')
+_Q_W_BOOKMARKSTART = qn('w:bookmarkStart')
+
 
 def _mr(text, italic=True):
+    return copy.deepcopy(_mr_template(text, italic))
+
+
+@functools.lru_cache(maxsize=512)
+def _mr_template(text, italic):
+    """Canonical m:r for (text, italic); callers deepcopy it."""
     r = OxmlElement('m:r')
     rPr = OxmlElement('m:rPr')
     sty = OxmlElement('m:sty')
-    sty.set(qn('m:val'), 'i' if italic else 'p')
+    sty.set(_Q_M_VAL, 'i' if italic else 'p')
     rPr.append(sty)
     r.append(rPr)
     wrPr = OxmlElement('w:rPr')
     rF = OxmlElement('w:rFonts')
-    rF.set(qn('w:ascii'), CAMBRIA_MATH)
-    rF.set(qn('w:hAnsi'), CAMBRIA_MATH)
+    rF.set(_Q_W_ASCII, CAMBRIA_MATH)
+    rF.set(_Q_W_HANSI, CAMBRIA_MATH)
     wrPr.append(rF)
     r.append(wrPr)
     t = OxmlElement('m:t')
@@ -289,19 +464,33 @@ def _t(text):
     return _mr(text, False)
 
 
-def _msub(base, sub, base_italic=True, sub_italic=True):
-    el = OxmlElement('m:sSub')
-    el.append(OxmlElement('m:sSubPr'))
-    e = OxmlElement('m:e')
-    e.append(_mr(base, base_italic))
-    el.append(e)
-    s = OxmlElement('m:sub')
-    s.append(_mr(sub, sub_italic))
-    el.append(s)
+# Empty m:sSub skeleton: sSubPr, e (base), sub
+_SSUB_TEMPLATE = parse_xml(f'<m:sSub {nsdecls("m")}><m:sSubPr/><m:e/><m:sub/></m:sSub>')
+
+
+def _msub_of(base_parts, sub_parts):
+    """Subscript with arbitrary OMML parts in the base and the subscript."""
+    el = copy.deepcopy(_SSUB_TEMPLATE)
+    el[1].extend(base_parts)
+    el[2].extend(sub_parts)
     return el
 
 
+def _msub(base, sub, base_italic=True, sub_italic=True):
+    return copy.deepcopy(_msub_template(base, sub, base_italic, sub_italic))
+
+
+@functools.lru_cache(maxsize=256)
+def _msub_template(base, sub, base_italic, sub_italic):
+    return _msub_of([_mr(base, base_italic)], [_mr(sub, sub_italic)])
+
+
 def _msup(base, sup, base_italic=True, sup_italic=True):
+    return copy.deepcopy(_msup_template(base, sup, base_italic, sup_italic))
+
+
+@functools.lru_cache(maxsize=256)
+def _msup_template(base, sup, base_italic, sup_italic):
     el = OxmlElement('m:sSup')
     el.append(OxmlElement('m:sSupPr'))
     e = OxmlElement('m:e')
@@ -315,10 +504,15 @@ def _msup(base, sup, base_italic=True, sup_italic=True):
 
 def _mbar(base, base_italic=True):
     """Overbar accent using OMML <m:bar> element (renders better than combining macron)."""
+    return copy.deepcopy(_mbar_template(base, base_italic))
+
+
+@functools.lru_cache(maxsize=64)
+def _mbar_template(base, base_italic):
     el = OxmlElement('m:bar')
     barPr = OxmlElement('m:barPr')
     pos = OxmlElement('m:pos')
-    pos.set(qn('m:val'), 'top')
+    pos.set(_Q_M_VAL, 'top')
     barPr.append(pos)
     el.append(barPr)
     e = OxmlElement('m:e')
@@ -329,19 +523,21 @@ def _mbar(base, base_italic=True):
 
 def _mbar_sub(base, sub, base_italic=True, sub_italic=True):
     """Barred base with subscript: properly nested as sSub(bar(base), sub)."""
-    el = OxmlElement('m:sSub')
-    el.append(OxmlElement('m:sSubPr'))
-    e = OxmlElement('m:e')
-    e.append(_mbar(base, base_italic))
-    el.append(e)
-    s = OxmlElement('m:sub')
-    s.append(_mr(sub, sub_italic))
-    el.append(s)
-    return el
+    return copy.deepcopy(_mbar_sub_template(base, sub, base_italic, sub_italic))
+
+
+@functools.lru_cache(maxsize=64)
+def _mbar_sub_template(base, sub, base_italic, sub_italic):
+    return _msub_of([_mbar(base, base_italic)], [_mr(sub, sub_italic)])
 
 
 def _msubsup(base, sub, sup):
     """Subscript-superscript combo."""
+    return copy.deepcopy(_msubsup_template(base, sub, sup))
+
+
+@functools.lru_cache(maxsize=64)
+def _msubsup_template(base, sub, sup):
     el = OxmlElement('m:sSubSup')
     el.append(OxmlElement('m:sSubSupPr'))
     e = OxmlElement('m:e')
@@ -361,11 +557,11 @@ def _nary(char, sub_parts, sup_parts, e_parts):
     el = OxmlElement('m:nary')
     pr = OxmlElement('m:naryPr')
     ch = OxmlElement('m:chr')
-    ch.set(qn('m:val'), char)
+    ch.set(_Q_M_VAL, char)
     pr.append(ch)
     if not sup_parts:
         supHide = OxmlElement('m:supHide')
-        supHide.set(qn('m:val'), '1')
+        supHide.set(_Q_M_VAL, '1')
         pr.append(supHide)
     el.append(pr)
     sub = OxmlElement('m:sub')
@@ -398,87 +594,58 @@ def _limlow(e_parts, lim_parts):
     return el
 
 
+_OMATH_TEMPLATE = OxmlElement('m:oMath')
+
+
 def omath(p, parts):
-    om = OxmlElement('m:oMath')
-    for part in parts:
-        om.append(part)
+    om = copy.deepcopy(_OMATH_TEMPLATE)
+    om.extend(parts)
     p._element.append(om)
 
 
+_EQ_SPACING_XML = '<w:spacing w:before="60" w:after="60"/>'
+# Children of a w:tblBorders that switches every table border off
+_NO_BORDERS_XML = ''.join(
+    f'<w:{edge} w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+    for edge in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'))
+# Borderless full-width 2-column table: equation cell 85%, number cell 15%
+_EQ_TBL = parse_xml(
+    f'<w:tbl {nsdecls("w")}>'
+    '<w:tblPr><w:jc w:val="center"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+    ' w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+    f'<w:tblBorders>{_NO_BORDERS_XML}</w:tblBorders>'
+    f'<w:tblW w:w="{TABLE_WIDTH_PCT}" w:type="pct"/></w:tblPr>'
+    '<w:tblGrid><w:gridCol w:w="4320"/><w:gridCol w:w="4320"/></w:tblGrid>'
+    '<w:tr>'
+    '<w:tc><w:tcPr><w:tcW w:w="8100" w:type="dxa"/><w:vAlign w:val="center"/></w:tcPr>'
+    f'<w:p><w:pPr><w:jc w:val="center"/>{_EQ_SPACING_XML}</w:pPr></w:p></w:tc>'
+    '<w:tc><w:tcPr><w:tcW w:w="1400" w:type="dxa"/><w:vAlign w:val="center"/></w:tcPr>'
+    f'<w:p><w:pPr><w:jc w:val="right"/>{_EQ_SPACING_XML}</w:pPr></w:p></w:tc>'
+    '</w:tr></w:tbl>')
+
+
 def omath_display(doc, body, cursor, parts, eq_num=None):
     """Display equation in a borderless 2-column table: centered equation + right-aligned number."""
-    tbl = doc.add_table(rows=1, cols=2)
-    tbl.alignment = WD_TABLE_ALIGNMENT.CENTER
-    # Remove all borders
-    tblPr = tbl._tbl.find(qn('w:tblPr'))
-    if tblPr is None:
-        tblPr = OxmlElement('w:tblPr')
-        tbl._tbl.insert(0, tblPr)
-    borders = OxmlElement('w:tblBorders')
-    for edge in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
-        e = OxmlElement(f'w:{edge}')
-        e.set(qn('w:val'), 'none')
-        e.set(qn('w:sz'), '0')
-        e.set(qn('w:space'), '0')
-        e.set(qn('w:color'), 'auto')
-        borders.append(e)
-    tblPr.append(borders)
-    # Full-width table
-    tblW = OxmlElement('w:tblW')
-    tblW.set(qn('w:w'), TABLE_WIDTH_PCT)
-    tblW.set(qn('w:type'), 'pct')
-    old_w = tblPr.find(qn('w:tblW'))
-    if old_w is not None:
-        tblPr.remove(old_w)
-    tblPr.append(tblW)
-    # Column widths: equation 85%, number 15%
-    for j, w in enumerate([8100, 1400]):
-        tc = tbl.cell(0, j)._tc
-        tcPr = tc.get_or_add_tcPr()
-        tcW = OxmlElement('w:tcW')
-        tcW.set(qn('w:w'), str(w))
-        tcW.set(qn('w:type'), 'dxa')
-        old = tcPr.find(qn('w:tcW'))
-        if old is not None:
-            tcPr.remove(old)
-        tcPr.append(tcW)
-    # Equation in first cell, centered
-    p0 = tbl.cell(0, 0).paragraphs[0]
-    p0.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    pPr0 = p0._element.get_or_add_pPr()
-    sp0 = OxmlElement('w:spacing')
-    sp0.set(qn('w:before'), '60')
-    sp0.set(qn('w:after'), '60')
-    pPr0.append(sp0)
-    om = OxmlElement('m:oMath')
-    for part in parts:
-        om.append(part)
-    p0._element.append(om)
-    # Number in second cell, right-aligned
-    p1 = tbl.cell(0, 1).paragraphs[0]
-    p1.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-    pPr1 = p1._element.get_or_add_pPr()
-    sp1 = OxmlElement('w:spacing')
-    sp1.set(qn('w:before'), '60')
-    sp1.set(qn('w:after'), '60')
-    pPr1.append(sp1)
+    tbl_el = copy.deepcopy(_EQ_TBL)
+    p0, p1 = tbl_el.iter(_Q_W_P)
+    # Equation in first cell
+    om = copy.deepcopy(_OMATH_TEMPLATE)
+    om.extend(parts)
+    p0.append(om)
+    # Number in second cell
     if eq_num:
         # Add bookmark target so in-text "equation (N)" mentions can link here
         bm_name = f'Eq{eq_num}'
         _eq_clean = eq_num.replace('.', '').replace('B', '90').replace('a', '01').replace('b', '02')
         bm_id_val = 800 + int(_eq_clean)
-        p1._element.append(make_bookmark(bm_id_val, bm_name))
-        p1.add_run(f'({eq_num})')
-        p1._element.append(make_bookmark_end(bm_id_val))
-    # Vertical center cell content
-    for j in range(2):
-        tc = tbl.cell(0, j)._tc
-        tcPr = tc.get_or_add_tcPr()
-        vAlign = OxmlElement('w:vAlign')
-        vAlign.set(qn('w:val'), 'center')
-        tcPr.append(vAlign)
-    tbl_el = tbl._tbl
-    body.remove(tbl_el)
+        p1.append(make_bookmark(bm_id_val, bm_name))
+        r = OxmlElement('w:r')
+        t = OxmlElement('w:t')
+        t.text = f'({eq_num})'
+        r.append(t)
+        p1.append(r)
+        p1.append(make_bookmark_end(bm_id_val))
     cursor.addnext(tbl_el)
     return None, tbl_el
 
@@ -487,85 +654,138 @@ def omath_display(doc, body, cursor, parts, eq_num=None):
 # ═══════════════════════════════════════════════════════════════════════
 
 
-def mkp(doc, body, cursor, space_before=None):
-    p = doc.add_paragraph()
+def new_paragraph(doc, text='', style=None):
+    """doc.add_paragraph() without the append: the w:p is created detached.
+
+    Callers place it with a single cursor.addnext() instead of letting
+    python-docx insert it before sectPr and then moving it.
+    """
+    p = Paragraph(OxmlElement('w:p'), doc._body)
+    if text:
+        p.add_run(text)
+    if style is not None:
+        p.style = style
+    return p
+
+
+def new_table(doc, rows, cols, style=None):
+    """doc.add_table() without the append; place the returned table's _tbl with addnext()."""
+    table = Table(CT_Tbl.new_tbl(rows, cols, doc._block_width), doc._body)
+    if style is not None:
+        table.style = style
+    return table
+
+
+def mkp(doc, body, cursor, space_before=None, space_after=None):
+    p = new_paragraph(doc)
     p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-    p.paragraph_format.first_line_indent = Inches(0)
-    p.paragraph_format.space_before = Pt(space_before if space_before is not None else 0)
-    p.paragraph_format.space_after = Pt(8)
+    p.paragraph_format.first_line_indent = _IN_0
+    p.paragraph_format.space_before = Pt(space_before) if space_before is not None else _PT_0
+    # space_after=2 keeps a lead-in paragraph close to the equation below it
+    p.paragraph_format.space_after = Pt(space_after) if space_after is not None else _PT_8
     el = p._element
-    body.remove(el)
     cursor.addnext(el)
     return p, el
 
 
 def mkh(doc, body, cursor, text, level=1):
-    p = doc.add_paragraph(text, style=f'Heading {level}')
+    p = new_paragraph(doc, text, style=f'Heading {level}')
     el = p._element
-    body.remove(el)
     cursor.addnext(el)
     return el
 
 
-def add_italic(p, text):
-    """Add an italic run to paragraph p."""
+def _remove_between(body, start_el, end_el, keep=()):
+    """Remove the siblings strictly between start_el and end_el, except those in keep."""
+    if not keep:
+        # One slice deletion: two C-level index scans instead of a Python loop
+        del body[body.index(start_el) + 1:body.index(end_el)]
+        return
+    el = start_el.getnext()
+    while el is not end_el and el is not None:
+        nxt = el.getnext()
+        if el not in keep:
+            body.remove(el)
+        el = nxt
+
+
+@functools.cache
+def _rpr_template(bold, italic, size, font):
+    """The w:rPr python-docx writes for these run settings (None = leave unset)."""
+    run = Run(OxmlElement('w:r'), None)
+    if bold is not None:
+        run.bold = bold
+    if italic is not None:
+        run.italic = italic
+    if size is not None:
+        run.font.size = size
+    if font is not None:
+        run.font.name = font
+    return run._r.rPr
+
+
+def add_run_styled(p, text, bold=None, italic=None, size=None, font=None):
+    """Add a run to paragraph p with its formatting cloned from a cached w:rPr."""
     r = p.add_run(text)
-    r.italic = True
+    r._r.insert(0, copy.deepcopy(_rpr_template(bold, italic, size, font)))
     return r
 
 
+def add_italic(p, text):
+    """Add an italic run to paragraph p."""
+    return add_run_styled(p, text, italic=True)
+
+
 def add_page_break(doc, body, after_el):
     """Insert a page break paragraph after after_el. Returns the new element."""
-    pb_p = doc.add_paragraph()
-    pb_p.paragraph_format.space_before = Pt(0)
-    pb_p.paragraph_format.space_after = Pt(0)
+    pb_p = new_paragraph(doc)
+    pb_p.paragraph_format.space_before = _PT_0
+    pb_p.paragraph_format.space_after = _PT_0
     pb_run = pb_p.add_run()
     br = OxmlElement('w:br')
     br.set(qn('w:type'), 'page')
     pb_run._element.append(br)
     pb_el = pb_p._element
-    body.remove(pb_el)
     after_el.addnext(pb_el)
     return pb_el
 
 
+_BOOKMARK_START = OxmlElement('w:bookmarkStart')
+_BOOKMARK_END = OxmlElement('w:bookmarkEnd')
+# Link run: colour and single underline; anchor, colour value and text are set per link
+_HYPERLINK_TEMPLATE = parse_xml(
+    f'<w:hyperlink {nsdecls("w")}><w:r><w:rPr><w:color/><w:u w:val="single"/></w:rPr>'
+    '<w:t xml:space="preserve"/></w:r></w:hyperlink>')
+
+
 def make_bookmark(bm_id, name):
     """Create a w:bookmarkStart element."""
-    bs = OxmlElement('w:bookmarkStart')
-    bs.set(qn('w:id'), str(bm_id))
-    bs.set(qn('w:name'), name)
+    bs = copy.deepcopy(_BOOKMARK_START)
+    bs.set(_Q_W_ID, str(bm_id))
+    bs.set(_Q_W_NAME, name)
     return bs
 
 
 def make_bookmark_end(bm_id):
     """Create a w:bookmarkEnd element."""
-    be = OxmlElement('w:bookmarkEnd')
-    be.set(qn('w:id'), str(bm_id))
+    be = copy.deepcopy(_BOOKMARK_END)
+    be.set(_Q_W_ID, str(bm_id))
     return be
 
 
 def make_hyperlink(anchor, text, rPr_orig=None, color=LINK_COLOR):
     """Create a w:hyperlink element with blue underlined text."""
-    hl = OxmlElement('w:hyperlink')
-    hl.set(qn('w:anchor'), anchor)
-    hl.set(qn('w:history'), '1')
-    r = OxmlElement('w:r')
+    hl = copy.deepcopy(_HYPERLINK_TEMPLATE)
+    hl.set(_Q_W_ANCHOR, anchor)
+    hl.set(_Q_W_HISTORY, '1')
+    rPr, t = hl[0]
     if rPr_orig is not None:
-        new_rPr = copy.deepcopy(rPr_orig)
-    else:
-        new_rPr = OxmlElement('w:rPr')
-    clr = OxmlElement('w:color')
-    clr.set(qn('w:val'), color)
-    uu = OxmlElement('w:u')
-    uu.set(qn('w:val'), 'single')
-    new_rPr.append(clr)
-    new_rPr.append(uu)
-    r.append(new_rPr)
-    t = OxmlElement('w:t')
-    t.set(XML_SPACE, SPACE_PRESERVE)
+        # lxml's deepcopy is a single C-level node copy; a Python-side clone of
+        # even a flat rPr measured ~7x slower. The original properties go
+        # ahead of the link colour and underline.
+        rPr[:0] = list(copy.deepcopy(rPr_orig))
+    rPr[-2].set(_Q_W_VAL, color)
     t.text = text
-    r.append(t)
-    hl.append(r)
     return hl
 
 
@@ -574,6 +794,7 @@ def make_hyperlink(anchor, text, rPr_orig=None, color=LINK_COLOR):
 # ═══════════════════════════════════════════════════════════════════════
 _fn_xml = [None]   # cached parsed footnotes XML
 _fn_part = [None]  # cached footnotes Part
+_fn_texts = []     # footnote texts in call order; position + 1 is the w:id
 
 W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
 
@@ -584,52 +805,58 @@ def init_footnotes(doc):
         if 'footnotes' in rel.reltype:
             _fn_part[0] = rel.target_part
             _fn_xml[0] = etree.fromstring(_fn_part[0].blob)
+            _fn_texts.clear()
             # Remove existing content footnotes (keep IDs 0 and -1 = Word separators)
             for fn in list(_fn_xml[0]):
-                fid = fn.get(f'{{{W_NS}}}id', '')
+                fid = fn.get(_Q_W_ID, '')
                 if fid not in ('0', '-1', ''):
                     _fn_xml[0].remove(fn)
             return
     print("  Warning: no footnotes part found in template")
 
 
-def make_footnote(p, fn_text, fn_id):
-    """Add a footnote at the end of paragraph p."""
+# Footnote body: FootnoteText paragraph, auto-number mark, then the text run
+_FN_TEMPLATE = etree.fromstring(
+    f'<w:footnote xmlns:w="{W_NS}"><w:p>'
+    '<w:pPr><w:pStyle w:val="FootnoteText"/></w:pPr>'
+    '<w:r><w:rPr><w:rStyle w:val="FootnoteReference"/></w:rPr><w:footnoteRef/></w:r>'
+    '<w:r><w:t xml:space="preserve"/></w:r>'
+    '</w:p></w:footnote>')
+
+# Footnote reference run placed in the main text
+_FN_REF_TEMPLATE = parse_xml(
+    f'<w:r {nsdecls("w")}><w:rPr><w:rStyle w:val="FootnoteReference"/></w:rPr>'
+    '<w:footnoteReference/></w:r>')
+
+
+def make_footnote(p, fn_text):
+    """Add a footnote reference at the end of paragraph p; returns its id.
+
+    Ids are assigned in call order (Word numbers footnotes by position, not
+    id); the footnote bodies are written in one go by flush_footnotes().
+    """
     if _fn_xml[0] is None:
-        return
-    fn_el = etree.SubElement(_fn_xml[0], f'{{{W_NS}}}footnote')
-    fn_el.set(f'{{{W_NS}}}id', str(fn_id))
-    fn_p = etree.SubElement(fn_el, f'{{{W_NS}}}p')
-    fn_pPr = etree.SubElement(fn_p, f'{{{W_NS}}}pPr')
-    fn_pStyle = etree.SubElement(fn_pPr, f'{{{W_NS}}}pStyle')
-    fn_pStyle.set(f'{{{W_NS}}}val', 'FootnoteText')
-    # Auto-number mark
-    fn_r1 = etree.SubElement(fn_p, f'{{{W_NS}}}r')
-    fn_rPr1 = etree.SubElement(fn_r1, f'{{{W_NS}}}rPr')
-    fn_rStyle1 = etree.SubElement(fn_rPr1, f'{{{W_NS}}}rStyle')
-    fn_rStyle1.set(f'{{{W_NS}}}val', 'FootnoteReference')
-    etree.SubElement(fn_r1, f'{{{W_NS}}}footnoteRef')
-    # Footnote text
-    fn_r2 = etree.SubElement(fn_p, f'{{{W_NS}}}r')
-    fn_t2 = etree.SubElement(fn_r2, f'{{{W_NS}}}t')
-    fn_t2.set(XML_SPACE, SPACE_PRESERVE)
-    fn_t2.text = ' ' + fn_text
-    # Footnote reference in main text
-    fn_ref_r = OxmlElement('w:r')
-    fn_ref_rPr = OxmlElement('w:rPr')
-    fn_ref_rStyle = OxmlElement('w:rStyle')
-    fn_ref_rStyle.set(qn('w:val'), 'FootnoteReference')
-    fn_ref_rPr.append(fn_ref_rStyle)
-    fn_ref_r.append(fn_ref_rPr)
-    fn_ref_el = OxmlElement('w:footnoteReference')
-    fn_ref_el.set(qn('w:id'), str(fn_id))
-    fn_ref_r.append(fn_ref_el)
+        return None
+    _fn_texts.append(fn_text)
+    fn_id = len(_fn_texts)
+    fn_ref_r = copy.deepcopy(_FN_REF_TEMPLATE)
+    fn_ref_r[1].set(_Q_W_ID, str(fn_id))
     p._element.append(fn_ref_r)
+    return fn_id
+
+
+def _footnote_el(fn_id, fn_text):
+    fn_el = copy.deepcopy(_FN_TEMPLATE)
+    fn_el.set(_Q_W_ID, str(fn_id))
+    # Last w:t is the footnote text (after the auto-number mark run)
+    fn_el[0][-1][0].text = ' ' + fn_text
+    return fn_el
 
 
 def flush_footnotes():
-    """Write cached footnotes XML back to the part."""
+    """Write the registered footnotes into the cached footnotes XML and back to the part."""
     if _fn_part[0] is not None and _fn_xml[0] is not None:
+        _fn_xml[0].extend(_footnote_el(i, t) for i, t in enumerate(_fn_texts, 1))
         _fn_part[0]._blob = etree.tostring(
             _fn_xml[0], xml_declaration=True, encoding='UTF-8', standalone=True)
 
@@ -696,40 +923,89 @@ CITATIONS = [
 ]
 
 # Auto-generate CITE_MAP: both "Author (Year)" and "Author Year" forms
-CITE_MAP = {}
-for _auth, _yr, _key, _ in CITATIONS:
-    CITE_MAP[f'{_auth} ({_yr})'] = _key   # narrative: Author (Year)
-    CITE_MAP[f'{_auth} {_yr}'] = _key      # parenthetical: Author Year
+CITE_MAP = {
+    cite: _key
+    for _auth, _yr, _key, _ in CITATIONS
+    for cite in (f'{_auth} ({_yr})',   # narrative: Author (Year)
+                 f'{_auth} {_yr}')     # parenthetical: Author Year
+}
 CITE_MAP['World Bank'] = 'WorldBank2024'   # bare mention without year
 CITE_MAP['Cloudscene'] = 'Cloudscene2025'  # bare mention without year
 # Abbreviated citation form (CITATIONS has "Sastry, Heim, et al.")
 CITE_MAP['Sastry et al. (2024)'] = 'Sastry2024'
 CITE_MAP['Sastry et al. 2024'] = 'Sastry2024'
 
+# Longest first so longer citations match first; the alternation only
+# screens text for "contains some citation"
+CITE_MAP_SORTED = tuple(sorted(CITE_MAP.items(), key=lambda x: -len(x[0])))
+CITE_RE = re.compile('|'.join(re.escape(c) for c, _ in CITE_MAP_SORTED))
+
 # Auto-generate REF_KEY_MAP for back-linking from reference list
 REF_KEY_MAP = {_key: _anchor for _, _, _key, _anchor in CITATIONS}
 
 
-def link_citations_pass(body, cite_map, bm_id):
-    """Single pass: find citation text in runs and replace with bookmark+hyperlink. Returns count."""
+@functools.lru_cache(maxsize=4)
+def _cite_automaton(sorted_cites):
+    """Aho-Corasick automaton over the citation strings, or None without pyahocorasick.
+
+    Each word maps to (rank, text, key) so the minimum over a run's hits is
+    the citation the longest-first scan would pick.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, (cite_text, key) in enumerate(sorted_cites):
+        automaton.add_word(cite_text, (rank, cite_text, key))
+    automaton.make_automaton()
+    return automaton
+
+
+def _find_citation(text, sorted_cites, any_cite, automaton):
+    """Return the (cite_text, key) to link in ``text``, or None."""
+    if automaton is not None:
+        hits = [v for _, v in automaton.iter(text)]
+        if not hits:
+            return None
+        _, cite_text, key = min(hits)
+        return cite_text, key
+    if not any_cite.search(text):
+        return None
+    for cite_text, key in sorted_cites:
+        if cite_text in text:
+            return cite_text, key
+    return None
+
+
+def link_citations_pass(body, sorted_cites, any_cite, bm_id):
+    """Single pass: find citation text in runs and replace with bookmark+hyperlink. Returns count.
+
+    ``sorted_cites`` is (text, key) pairs longest first; ``any_cite`` matches
+    any of them and rejects paragraphs/runs that cite nothing in one scan.
+    With pyahocorasick installed, runs are matched in a single automaton pass.
+    """
     count = 0
-    # Sort by length descending so longer citations match first
-    sorted_cites = sorted(cite_map.items(), key=lambda x: -len(x[0]))
-    for p_el in list(body.findall(qn('w:p'))):
+    automaton = _cite_automaton(sorted_cites)
+    for p_el in list(body.findall(_Q_W_P)):
+        # A citation inside a run is also inside the paragraph's run text
+        p_text = ''.join(t.text or '' for r in p_el.iterchildren(_Q_W_R) for t in r.iterchildren(_Q_W_T))
+        if not any_cite.search(p_text):
+            continue
         for child in list(p_el):
-            if child.tag != qn('w:r'):
+            if child.tag != _Q_W_R:
                 continue
-            t_el = child.find(qn('w:t'))
+            t_el = child.find(_Q_W_T)
             if t_el is None or not t_el.text:
                 continue
             text = t_el.text
-            for cite_text, key in sorted_cites:
-                if cite_text not in text:
-                    continue
+            found = _find_citation(text, sorted_cites, any_cite, automaton)
+            if found is not None:
+                cite_text, key = found
                 idx = text.index(cite_text)
                 before = text[:idx]
                 after = text[idx + len(cite_text):]
-                rPr_orig = child.find(qn('w:rPr'))
+                rPr_orig = child.find(_Q_W_RPR)
                 # Modify current run to "before" text only
                 t_el.text = before
                 t_el.set(XML_SPACE, SPACE_PRESERVE)
@@ -757,8 +1033,7 @@ def link_citations_pass(body, cite_map, bm_id):
                     ta.text = after
                     ra.append(ta)
                     ins.addnext(ra)
-                count += 1
-                break  # one per run per pass
+                count += 1  # one per run per pass
     return count
 
 
@@ -815,225 +1090,179 @@ def find_italic_portion(full_rt):
 
 def _write_ref_segments(p, text, italic_portion):
     """Write reference text with italic journal/book title."""
-    if italic_portion and italic_portion in text:
-        idx = text.index(italic_portion)
-        if idx > 0:
-            p.add_run(text[:idx])
-        r = p.add_run(italic_portion)
-        r.italic = True
-        after = text[idx + len(italic_portion):]
-        if after:
-            p.add_run(after)
-    else:
+    idx = text.find(italic_portion) if italic_portion else -1
+    if idx < 0:
         p.add_run(text)
+        return
+    if idx > 0:
+        p.add_run(text[:idx])
+    add_italic(p, italic_portion)
+    end = idx + len(italic_portion)
+    if end < len(text):
+        p.add_run(text[end:])
+
+
+_TBL_PR_XML = (
+    '<w:tblPr><w:tblStyle w:val="TableGrid"/>'
+    f'<w:tblW w:type="pct" w:w="{TABLE_WIDTH_PCT}"/><w:jc w:val="center"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+    ' w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+    f'<w:tblBorders>{_NO_BORDERS_XML}</w:tblBorders></w:tblPr>')
+_CELL_SPACING_XML = '<w:spacing w:before="10" w:after="10"/>'
+# Academic-style rules: single above/below the header, double below the last row
+_HEAD_BORDERS_XML = ('<w:tcBorders><w:top w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+                     '<w:bottom w:val="single" w:sz="4" w:space="0" w:color="auto"/></w:tcBorders>')
+_LAST_BORDERS_XML = '<w:tcBorders><w:bottom w:val="double" w:sz="4" w:space="0" w:color="auto"/></w:tcBorders>'
+# Parsed forms for tables still assembled through python-docx (deepcopy per use)
+_NO_BORDERS = parse_xml(f'<w:tblBorders {nsdecls("w")}>{_NO_BORDERS_XML}</w:tblBorders>')
+_CELL_SPACING = parse_xml(f'<w:spacing {nsdecls("w")} w:before="10" w:after="10"/>')
+_HEAD_BORDERS = parse_xml(_HEAD_BORDERS_XML.replace('<w:tcBorders>', f'<w:tcBorders {nsdecls("w")}>', 1))
+_LAST_BORDERS = parse_xml(_LAST_BORDERS_XML.replace('<w:tcBorders>', f'<w:tcBorders {nsdecls("w")}>', 1))
+
+
+def _table_xml(headers, rows, col_widths, grid_w):
+    """Serialized w:tbl for add_table, with empty text runs to be filled in.
+
+    Matches what doc.add_table plus the old per-cell formatting produced:
+    header cells bold and centered, columns from the third on right-aligned,
+    8pt text, explicit widths replacing the evenly split grid width.
+    """
+    nc = len(headers)
+    last = len(rows) - 1
+    # One w:tcW per column, shared by every row
+    if col_widths:
+        tcw = [f'<w:tcW w:w="{w}" w:type="dxa"/>' for w in col_widths]
+    else:
+        tcw = [f'<w:tcW w:type="dxa" w:w="{grid_w}"/>'] * nc
+
+    def tc(j, borders, jc, bold, filled=True):
+        tcPr = (f'<w:tcPr>{borders}{tcw[j]}</w:tcPr>' if col_widths
+                else f'<w:tcPr>{tcw[j]}{borders}</w:tcPr>')
+        if not filled:  # cell past the end of a short row: left as created
+            return f'<w:tc>{tcPr}<w:p><w:pPr>{_CELL_SPACING_XML}</w:pPr></w:p></w:tc>'
+        return (f'<w:tc>{tcPr}<w:p><w:pPr>{jc}{_CELL_SPACING_XML}</w:pPr><w:r/>'
+                f'<w:r><w:rPr>{bold}<w:sz w:val="16"/></w:rPr></w:r></w:p></w:tc>')
+
+    parts = [f'<w:tbl {nsdecls("w")}>', _TBL_PR_XML, '<w:tblGrid>',
+             f'<w:gridCol w:w="{grid_w}"/>' * nc, '</w:tblGrid><w:tr>']
+    parts += [tc(j, _HEAD_BORDERS_XML, '<w:jc w:val="center"/>', '<w:b/>') for j in range(nc)]
+    parts.append('</w:tr>')
+    # Body cells differ only by column (and the last row's border): build each once
+    body_jc = ['<w:jc w:val="right"/>' if j >= 2 else '' for j in range(nc)]
+    body_tcs = [tc(j, '', body_jc[j], '') for j in range(nc)]
+    last_tcs = [tc(j, _LAST_BORDERS_XML, body_jc[j], '') for j in range(nc)]
+    empty_tcs = [tc(j, '', '', '', filled=False) for j in range(nc)]
+    for i, row in enumerate(rows):
+        n_filled = min(len(row), nc)
+        parts.append('<w:tr>')
+        parts += (last_tcs if i == last else body_tcs)[:n_filled]
+        parts += empty_tcs[n_filled:]
+        parts.append('</w:tr>')
+    parts.append('</w:tbl>')
+    return ''.join(parts)
 
 
 def add_table(doc, body, after_el, headers, rows, col_widths=None, title=None):
     if title:
-        tp = doc.add_paragraph()
-        tp.paragraph_format.space_before = Pt(6)
-        tp.paragraph_format.space_after = Pt(3)
-        tp.paragraph_format.first_line_indent = Inches(0)
-        run = tp.add_run(title)
-        run.bold = True
-        run.font.size = Pt(10)
+        tp = new_paragraph(doc)
+        tp.paragraph_format.space_before = _PT_6
+        tp.paragraph_format.space_after = _PT_3
+        tp.paragraph_format.first_line_indent = _IN_0
+        add_run_styled(tp, title, bold=True, size=_PT_10)
         tbl_el = tp._element
-        body.remove(tbl_el)
         after_el.addnext(tbl_el)
         after_el = tbl_el
-    nr = len(rows) + 1
+    tbl_el = parse_xml(_table_xml(headers, rows, col_widths, Emu(doc._block_width // len(headers)).twips))
+    # Fill run text through CT_R so tabs/newlines/whitespace serialize as add_run would;
+    # _table_xml has one text run per header column, so values past it are dropped
     nc = len(headers)
-    table = doc.add_table(rows=nr, cols=nc)
-    table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.style = 'Table Grid'
-    # Remove all table-level borders
-    tblPr = table._tbl.find(qn('w:tblPr'))
-    if tblPr is None:
-        tblPr = OxmlElement('w:tblPr')
-        table._tbl.insert(0, tblPr)
-    old_borders = tblPr.find(qn('w:tblBorders'))
-    if old_borders is not None:
-        tblPr.remove(old_borders)
-    tblBorders = OxmlElement('w:tblBorders')
-    for side in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
-        b = OxmlElement(f'w:{side}')
-        b.set(qn('w:val'), 'none')
-        b.set(qn('w:sz'), '0')
-        b.set(qn('w:space'), '0')
-        b.set(qn('w:color'), 'auto')
-        tblBorders.append(b)
-    tblPr.append(tblBorders)
-    # AutoFit to window: 100% page width
-    tblW = tblPr.find(qn('w:tblW'))
-    if tblW is None:
-        tblW = OxmlElement('w:tblW')
-        tblPr.append(tblW)
-    tblW.set(qn('w:w'), TABLE_WIDTH_PCT)
-    tblW.set(qn('w:type'), 'pct')
-    # Academic-style horizontal rules on header row (top + bottom)
-
-    def _cell_border(tc, sides, style='single'):
-        tcPr = tc.get_or_add_tcPr()
-        tcB = OxmlElement('w:tcBorders')
-        for s in sides:
-            b = OxmlElement(f'w:{s}')
-            b.set(qn('w:val'), style)
-            b.set(qn('w:sz'), '4')
-            b.set(qn('w:space'), '0')
-            b.set(qn('w:color'), 'auto')
-            tcB.append(b)
-        tcPr.append(tcB)
-    for j, h in enumerate(headers):
-        c = table.cell(0, j)
-        c.text = ""
-        pp = c.paragraphs[0]
-        pp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = pp.add_run(h)
-        run.bold = True
-        run.font.size = Pt(8)
-        _cell_border(c._tc, ['top', 'bottom'])
-    for i, row in enumerate(rows):
-        for j, val in enumerate(row):
-            c = table.cell(i + 1, j)
-            c.text = ""
-            pp = c.paragraphs[0]
-            if j >= 2:
-                pp.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            run = pp.add_run(str(val))
-            run.font.size = Pt(8)
-            # Double bottom border on last data row
-            if i == len(rows) - 1:
-                _cell_border(c._tc, ['bottom'], style='double')
-    if col_widths:
-        for j, w in enumerate(col_widths):
-            for i in range(nr):
-                c = table.cell(i, j)
-                tcPr = c._tc.get_or_add_tcPr()
-                tcW = OxmlElement('w:tcW')
-                tcW.set(qn('w:w'), str(w))
-                tcW.set(qn('w:type'), 'dxa')
-                old = tcPr.find(qn('w:tcW'))
-                if old is not None:
-                    tcPr.remove(old)
-                tcPr.append(tcW)
-    for row in table.rows:
-        for cell in row.cells:
-            for pp in cell.paragraphs:
-                pPr = pp._element.get_or_add_pPr()
-                sp = OxmlElement('w:spacing')
-                sp.set(qn('w:before'), '10')
-                sp.set(qn('w:after'), '10')
-                pPr.append(sp)
-    tbl_el = table._tbl
-    body.remove(tbl_el)
+    texts = iter([*map(str, headers), *(str(val) for row in rows for val in row[:nc])])
+    for r in tbl_el.iter(_Q_W_R):
+        if len(r):  # the text run; the empty w:r before it mirrors cell.text = ""
+            r.text = next(texts)
     after_el.addnext(tbl_el)
     return tbl_el
 
 
-def write_title_and_abstract(doc, body, all_el, hmap):
+# Front matter below the title, as python-docx would write it; {version} is the
+# only dynamic field. Spacing is in twips (Pt(12) = 240).
+_FM_BLANK_XML = ('<w:p><w:pPr><w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/>'
+                 '<w:ind w:firstLine="0"/><w:jc w:val="both"/></w:pPr>'
+                 '<w:r><w:t xml:space="preserve"> </w:t></w:r></w:p>')
+_FRONTMATTER_XML = (
+    f'<w:body {nsdecls("w")}>'
+    # Author (footnote reference appended by make_footnote)
+    '<w:p><w:pPr><w:spacing w:before="240" w:after="240"/><w:ind w:firstLine="0"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:i/></w:rPr><w:t>Michael Lokshin</w:t></w:r></w:p>'
+    # Version stamp
+    '<w:p><w:pPr><w:spacing w:before="40" w:after="240"/><w:ind w:firstLine="0"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r><w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/><w:color w:val="808080"/>'
+    '<w:sz w:val="18"/></w:rPr><w:t>{version}</w:t></w:r></w:p>'
+    # Abstract
+    '<w:p><w:pPr><w:spacing w:before="240" w:after="160" w:line="240" w:lineRule="auto"/>'
+    '<w:ind w:firstLine="0" w:left="720" w:right="720"/><w:jc w:val="both"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t>Abstract</w:t></w:r><w:r><w:t>'
+    ': This paper develops a trade model in which AI compute is produced and traded '
+    'internationally. Latency-insensitive AI training can be offshored '
+    'to the lowest-cost producers, while latency-sensitive inference favors proximity '
+    'to users; a sovereignty premium captures governments\u2019 preference for domestic data '
+    'processing. Calibration across 85 countries shows that energy-abundant economies '
+    'have a comparative advantage in training compute, while regional inference hubs '
+    'form around major demand centers. Because hardware costs are globally uniform, '
+    'cross-country cost differences are small, making institutional quality, reliability, '
+    'and policy constraints decisive for the location of compute facilities. For energy-rich developing '
+    'countries with limited export diversification, compute exports offer a route to '
+    'convert natural resources into high-value digital services and integrate into the '
+    'global economy.'
+    '</w:t></w:r></w:p>'
+    + _FM_BLANK_XML + _FM_BLANK_XML +
+    # JEL classification and keywords
+    '<w:p><w:pPr><w:spacing w:before="0" w:after="160" w:line="240" w:lineRule="auto"/>'
+    '<w:ind w:firstLine="0" w:left="720" w:right="720"/><w:jc w:val="both"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">JEL Classification: </w:t></w:r>'
+    '<w:r><w:t>F14, F18, L86, O14, O33, Q40</w:t></w:r></w:p>'
+    '<w:p><w:pPr><w:spacing w:before="40" w:after="160" w:line="240" w:lineRule="auto"/>'
+    '<w:ind w:firstLine="0" w:left="720" w:right="720"/><w:jc w:val="both"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">Keywords: </w:t></w:r>'
+    '<w:r><w:t>compute trade, FLOPs, artificial intelligence, data centers, '
+    'comparative advantage, electricity costs, developing countries</w:t></w:r></w:p>'
+    '</w:body>'
+)
+
+
+def write_title_and_abstract(doc, body, all_el, hmap, build_time=None):
     print("Rewriting title and abstract...")
     # Replace title (first element — no previous, so clear and rewrite in place)
     title_el = all_el[0]
     for child in list(title_el):
-        if child.tag != qn('w:pPr'):
+        if child.tag != _Q_W_PPR:
             title_el.remove(child)
     title_p = doc.paragraphs[0]
     title_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    title_p.paragraph_format.first_line_indent = Inches(0)
-    title_p.paragraph_format.space_before = Pt(0)
-    title_p.paragraph_format.space_after = Pt(0)
-    r_title = title_p.add_run('Selling FLOPs:\nCompute Exports as a New Industry for Developing Countries')
-    r_title.bold = False
-    r_title.font.size = Pt(16)
-    r_title.font.name = TIMES_NEW_ROMAN
-
-    # Add author name
-    author_p, author_el = mkp(doc, body, title_el, space_before=12)
-    author_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    author_p.paragraph_format.space_after = Pt(12)
-    r_author = author_p.add_run('Michael Lokshin')
-    r_author.italic = True
-    make_footnote(author_p,
+    title_p.paragraph_format.first_line_indent = _IN_0
+    title_p.paragraph_format.space_before = _PT_0
+    title_p.paragraph_format.space_after = _PT_0
+    add_run_styled(title_p, 'Selling FLOPs:\nCompute Exports as a New Industry for Developing Countries',
+                   bold=False, size=_PT_16, font=TIMES_NEW_ROMAN)
+
+    # Author, version stamp, abstract, two blank lines, JEL codes and keywords:
+    # fixed content, parsed from one template and spliced in after the title
+    body.remove(hmap['abs'])
+    body.remove(all_el[2])  # old abstract text
+    if build_time is None:
+        build_time = datetime.now()
+    version = f'v21  \u2014  {build_time:%B %d, %Y  %H:%M}'
+    frag = parse_xml(_FRONTMATTER_XML.format(version=version))
+    author_el, ver_el, abs_text_el, _, _, _, kw_el = els = list(frag)
+    cur = title_el
+    for el in els:
+        cur.addnext(el)
+        cur = el
+    make_footnote(Paragraph(author_el, doc._body),
                   'This paper\u2019s findings, interpretations, and conclusions are entirely those of the '
                   'author and do not necessarily represent the views of the author\u2019s employer, the '
                   'World Bank, its Executive Directors, or the countries they represent. '
-                  'Michael Lokshin: mlokshin@worldbank.org', 1)
-
-    # Version stamp
-    ver_p, ver_el = mkp(doc, body, author_el, space_before=2)
-    ver_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    ver_p.paragraph_format.space_after = Pt(12)
-    r_ver = ver_p.add_run(f'v21  \u2014  {datetime.now().strftime("%B %d, %Y  %H:%M")}')
-    r_ver.font.size = Pt(9)
-    r_ver.font.color.rgb = RGBColor(128, 128, 128)
-    r_ver.font.name = TIMES_NEW_ROMAN
-
-    # Replace Abstract heading + text with single paragraph
-    # Remove old Abstract heading
-    abs_heading = hmap['abs']
-    abs_text = all_el[2]
-    body.remove(abs_heading)
-    body.remove(abs_text)
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-    p.paragraph_format.first_line_indent = Inches(0)
-    p.paragraph_format.left_indent = Inches(0.5)
-    p.paragraph_format.right_indent = Inches(0.5)
-    p.paragraph_format.space_before = Pt(12)
-    p.paragraph_format.space_after = Pt(8)
-    p.paragraph_format.line_spacing = 1.0
-    r_abs_label = p.add_run('Abstract')
-    r_abs_label.bold = True
-    p.add_run(
-        ': This paper develops a trade model in which AI compute is produced and traded '
-        'internationally. Latency-insensitive AI training can be offshored '
-        'to the lowest-cost producers, while latency-sensitive inference favors proximity '
-        'to users; a sovereignty premium captures governments\u2019 preference for domestic data '
-        'processing. Calibration across 85 countries shows that energy-abundant economies '
-        'have a comparative advantage in training compute, while regional inference hubs '
-        'form around major demand centers. Because hardware costs are globally uniform, '
-        'cross-country cost differences are small, making institutional quality, reliability, '
-        'and policy constraints decisive for the location of compute facilities. For energy-rich developing '
-        'countries with limited export diversification, compute exports offer a route to '
-        'convert natural resources into high-value digital services and integrate into the '
-        'global economy.'
-    )
-    el = p._element
-    body.remove(el)
-    ver_el.addnext(el)
-    abs_text_el = el
-
-    # Two blank lines after abstract (explicit empty paragraphs)
-    p_blank1, blank1_el = mkp(doc, body, abs_text_el)
-    p_blank1.paragraph_format.space_before = Pt(0)
-    p_blank1.paragraph_format.space_after = Pt(0)
-    p_blank1.paragraph_format.line_spacing = 1.0
-    p_blank1.add_run(' ')
-    p_blank2, blank2_el = mkp(doc, body, blank1_el)
-    p_blank2.paragraph_format.space_before = Pt(0)
-    p_blank2.paragraph_format.space_after = Pt(0)
-    p_blank2.paragraph_format.line_spacing = 1.0
-    p_blank2.add_run(' ')
-
-    # JEL classification and keywords after abstract
-    p_jel, jel_el = mkp(doc, body, blank2_el, space_before=0)
-    p_jel.paragraph_format.left_indent = Inches(0.5)
-    p_jel.paragraph_format.right_indent = Inches(0.5)
-    p_jel.paragraph_format.line_spacing = 1.0
-    r_jel_label = p_jel.add_run('JEL Classification: ')
-    r_jel_label.bold = True
-    p_jel.add_run('F14, F18, L86, O14, O33, Q40')
-
-    p_kw, kw_el = mkp(doc, body, jel_el, space_before=2)
-    p_kw.paragraph_format.left_indent = Inches(0.5)
-    p_kw.paragraph_format.right_indent = Inches(0.5)
-    p_kw.paragraph_format.line_spacing = 1.0
-    r_kw_label = p_kw.add_run('Keywords: ')
-    r_kw_label.bold = True
-    p_kw.add_run(
-        'compute trade, FLOPs, artificial intelligence, data centers, '
-        'comparative advantage, electricity costs, developing countries'
-    )
+                  'Michael Lokshin: mlokshin@worldbank.org')
 
     return title_el, author_el, ver_el, abs_text_el, kw_el
 
@@ -1101,7 +1330,7 @@ def write_introduction(doc, body, hmap):
                   'in Kenya (2024); AWS committed $5.3 billion to a cloud region in Saudi Arabia (2024); '
                   'Morocco allocated $1.1 billion under its Digital Morocco 2030 strategy; '
                   'Microsoft ($2.2 billion) and Google ($2 billion) announced data centers in Malaysia (2024); '
-                  'Microsoft committed $1.7 billion to cloud and AI infrastructure in Indonesia (2024).', 4)
+                  'Microsoft committed $1.7 billion to cloud and AI infrastructure in Indonesia (2024).')
     p.add_run(
         ' Cloud computing exports already exceed $9 billion annually, with the United States '
         'accounting for 87% of the global total (World Bank 2025). '
@@ -1115,7 +1344,7 @@ def write_introduction(doc, body, hmap):
                   '$0.80\u20131.20/GPU-hour, yielding gross revenue of $630\u2013950 million. '
                   'Hyperscaler retail rates ($2.00\u20132.50/GPU-hour) represent an upper bound that '
                   'is unlikely for a new market entrant. Even at the wholesale lower bound, '
-                  'this exceeds 15% of Kyrgyzstan\u2019s $3.8 billion in goods exports (2024).', 5)
+                  'this exceeds 15% of Kyrgyzstan\u2019s $3.8 billion in goods exports (2024).')
 
     # Para 9: First paper + contributions
     p, cur = mkp(doc, body, cur)
@@ -1237,13 +1466,7 @@ def write_production_technology(doc, body, hmap):
 
     # Clear everything between Section 3 heading and Section 3.2 heading,
     # preserving the Section 3.1 heading element
-    all_now = list(body)
-    s1i = all_now.index(hmap['1'])
-    s12i = all_now.index(hmap['1.2'])
-    s11_el = hmap['1.1']
-    for el in all_now[s1i + 1:s12i]:
-        if el is not s11_el:
-            body.remove(el)
+    _remove_between(body, hmap['1'], hmap['1.2'], keep={hmap['1.1']})
     cur = hmap['1']  # start after Section 3 heading
 
     # Para 1: linking paragraph from lit review to model (before 3.1 subtitle)
@@ -1279,12 +1502,10 @@ def write_production_technology(doc, body, hmap):
                   'increasingly priced per token (dollars per million tokens) and training '
                   'per GPU-hour or per job. Because tokens per GPU-hour are determined by '
                   'model architecture and serving software\u2014not by country of production\u2014'
-                  'the choice of unit does not affect cross-country cost comparisons.', 6)
-    # Bump all subsequent footnotes by 1
-    # (old fn 6 becomes 7, old fn 7 becomes 8, etc.)
+                  'the choice of unit does not affect cross-country cost comparisons.')
 
     # PUE inlined (no display equation) — merged with equation lead-in
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run(
         'A data center consumes electricity not only for its GPUs but also for '
         'cooling, power distribution, and lighting. '
@@ -1302,8 +1523,7 @@ def write_production_technology(doc, body, hmap):
                   'temperature\u2013PUE relationship. The robustness check in Section 6 confirms that '
                   'the results are insensitive to this specification. '
                   'Google (2024) reports a fleet-wide trailing '
-                  'twelve-month PUE of 1.10.', 7)
-    p.paragraph_format.space_after = Pt(2)
+                  'twelve-month PUE of 1.10.')
 
     # Equation (2): cost function (with networking η)
     _, cur = omath_display(doc, body, cur, [
@@ -1343,7 +1563,7 @@ def write_production_technology(doc, body, hmap):
     p.add_run(' = utilization rate),')
     make_footnote(p, 'For the NVIDIA H100: $25,000 / (3 years \u00d7 8,766 hours/year \u00d7 70% '
                   'utilization) \u2248 $1.36/hr. Street prices have fallen to $18,000\u2013$22,000 '
-                  'as of late 2025. Each GPU draws approximately 700 watts.', 9)
+                  'as of late 2025. Each GPU draws approximately 700 watts.')
     p.add_run(' ')
     omath(p, [_v('\u03B7')])
     p.add_run(
@@ -1366,7 +1586,7 @@ def write_production_technology(doc, body, hmap):
                   'Huawei\u2019s Ascend series (910B/910C) and other domestic accelerators. If these '
                   'achieve comparable FLOPs per watt at lower prices, China\u2019s effective \u03C1 could '
                   'diverge from the NVIDIA-based benchmark used here, potentially improving its '
-                  'cost position despite export controls.', 10)
+                  'cost position despite export controls.')
     p.add_run(
         ' Cross-country variation in '
     )
@@ -1397,11 +1617,7 @@ def write_production_technology(doc, body, hmap):
 def write_trade_costs(doc, body, hmap):
     print("Rewriting Section 3.2 (Trade Costs)...")
 
-    all_now = list(body)
-    s12i = all_now.index(hmap['1.2'])
-    s2i = all_now.index(hmap['2'])
-    for el in all_now[s12i + 1:s2i]:
-        body.remove(el)
+    _remove_between(body, hmap['1.2'], hmap['2'])
     cur = hmap['1.2']
 
     # Redefine two service types (merged with latency definition)
@@ -1455,7 +1671,7 @@ def write_trade_costs(doc, body, hmap):
     )
 
     # Equation (3): delivered cost with ξ_j
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run('The delivered cost of service ')
     omath(p, [_v('s'), _t(' \u2208 {'), _v('T'), _t(', '), _v('I'), _t('}')])
     p.add_run(' from seller ')
@@ -1463,7 +1679,6 @@ def write_trade_costs(doc, body, hmap):
     p.add_run(' to buyer ')
     omath(p, [_v('k')])
     p.add_run(' is:')
-    p.paragraph_format.space_after = Pt(2)
 
     _, cur = omath_display(doc, body, cur, [
         _msub('P', 's'), _t('('), _v('j'), _t(', '), _v('k'),
@@ -1538,13 +1753,13 @@ def renumber_sections(hmap):
     for key, old, new in renumber:
         if key in hmap:
             el = hmap[key]
-            for t in el.findall(f'.//{qn("w:t")}'):
+            for t in el.iter(_Q_W_T):
                 if t.text and old in t.text:
                     t.text = t.text.replace(old, new, 1)
                     break
     # Rename Section 3.1 heading
     if '1.1' in hmap:
-        for t in hmap['1.1'].findall(f'.//{qn("w:t")}'):
+        for t in hmap['1.1'].iter(_Q_W_T):
             if t.text and 'Production Technology' in t.text:
                 t.text = t.text.replace('Production Technology',
                                         'Production Technology and Cost Structure')
@@ -1560,7 +1775,7 @@ def write_demand(doc, body, hmap, demand_data):
     cur = mkh(doc, body, s2.getprevious(), '3.3 Global Compute Demand', level=2)
 
     # Demand specification: Equation (4)
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run(
         'The model is closed by specifying demand for compute services. Let '
     )
@@ -1573,7 +1788,6 @@ def write_demand(doc, body, hmap, demand_data):
         '. The paper measures compute demand '
         'using installed data center capacity in megawatts (MW):'
     )
-    p.paragraph_format.space_after = Pt(2)
 
     # Equation (4): q_k = ω_k · Q
     _, cur = omath_display(doc, body, cur, [
@@ -1606,8 +1820,7 @@ def write_demand(doc, body, hmap, demand_data):
                   'compute consumption is driven by data center infrastructure, not aggregate '
                   'income. Ireland and the Netherlands, for example, host far more capacity '
                   'per capita than their GDP shares would predict, while large economies like '
-                  'India and Brazil account for modest shares of global data center power.',
-                  20)
+                  'India and Brazil account for modest shares of global data center power.')
 
 
     # Training/inference split
@@ -1636,7 +1849,7 @@ def write_demand(doc, body, hmap, demand_data):
                   'occupy a middle ground, tolerating moderate latency but requiring sustained GPU '
                   'allocation and proximity to data. Using installed capacity to proxy demand is a '
                   'static assumption; endogenizing demand, for instance proportional to GDP or digital '
-                  'adoption, is a natural extension.', 21)
+                  'adoption, is a natural extension.')
 
 
 def write_sourcing_and_equilibrium(doc, body, hmap, demand_data):
@@ -1647,7 +1860,7 @@ def write_sourcing_and_equilibrium(doc, body, hmap, demand_data):
     cur = mkh(doc, body, s2.getprevious(), '3.4 Sourcing and Market Equilibrium', level=2)
 
     # Sourcing rule: Equation (4)
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run(
         'For each service type '
     )
@@ -1655,7 +1868,6 @@ def write_sourcing_and_equilibrium(doc, body, hmap, demand_data):
     p.add_run(', each buyer ')
     omath(p, [_v('k')])
     p.add_run(' chooses the source that minimizes the delivered cost:')
-    p.paragraph_format.space_after = Pt(2)
 
     _, cur = omath_display(doc, body, cur, [
         _msubsup('j', 's', '*'), _t('('), _v('k'),
@@ -1707,25 +1919,8 @@ def write_sourcing_and_equilibrium(doc, body, hmap, demand_data):
         'The equilibrium training price equals the marginal exporter\u2019s cost: '
     )
     # p_T = c_{(m_T)} — inline (was display Eq 5)
-    # Build subscript manually: c with subscript containing "(m_T)"
-    c_sub = OxmlElement('m:sSub')
-    c_sub.append(OxmlElement('m:sSubPr'))
-    c_e = OxmlElement('m:e')
-    c_e.append(_mr('c', True))
-    c_sub.append(c_e)
-    c_sub_content = OxmlElement('m:sub')
-    c_sub_content.append(_mr('(', False))
-    mt_sub = OxmlElement('m:sSub')
-    mt_sub.append(OxmlElement('m:sSubPr'))
-    mt_e = OxmlElement('m:e')
-    mt_e.append(_mr('m', True))
-    mt_sub.append(mt_e)
-    mt_s = OxmlElement('m:sub')
-    mt_s.append(_mr('T', True))
-    mt_sub.append(mt_s)
-    c_sub_content.append(mt_sub)
-    c_sub_content.append(_mr(')', False))
-    c_sub.append(c_sub_content)
+    # c with the nested subscript "(m_T)"
+    c_sub = _msub_of([_v('c')], [_t('('), _msub('m', 'T'), _t(')')])
     omath(p, [_msub('p', 'T'), _t(' = '), c_sub])
     p.add_run('.')
 
@@ -1757,7 +1952,7 @@ def write_sourcing_and_equilibrium(doc, body, hmap, demand_data):
     )
 
     # Inference: Equation (6)  [was display Eq 7, renumbered after inlining p_T]
-    p, cur = mkp(doc, body, cur, space_before=6)
+    p, cur = mkp(doc, body, cur, space_before=6, space_after=2)
     add_italic(p, 'Inference market. ')
     p.add_run('Since ')
     omath(p, [_msub('\u03C4', 'I'), _t(' = '), _v('\u03C4'), _t(' > 0')])
@@ -1776,35 +1971,15 @@ def write_sourcing_and_equilibrium(doc, body, hmap, demand_data):
     )
     omath(p, [_v('k')])
     p.add_run(' is:')
-    p.paragraph_format.space_after = Pt(2)
 
     # Build l_{m_I(k), k} and c_{m_I(k)} with (k) INSIDE the subscript
     # l subscripted with "m_I(k), k"
-    l_sub = OxmlElement('m:sSub')
-    l_sub.append(OxmlElement('m:sSubPr'))
-    l_e = OxmlElement('m:e')
-    l_e.append(_mr('l', True))
-    l_sub.append(l_e)
-    l_s = OxmlElement('m:sub')
-    l_s.append(_msub('m', 'I'))
-    l_s.append(_mr('(', False))
-    l_s.append(_mr('k', True))
-    l_s.append(_mr('),\u2009', False))
-    l_s.append(_mr('k', True))
-    l_sub.append(l_s)
+    l_sub = _msub_of([_v('l')], [
+        _msub('m', 'I'), _t('('), _v('k'), _t('),\u2009'), _v('k'),
+    ])
 
     # c subscripted with "m_I(k)"
-    c_sub2 = OxmlElement('m:sSub')
-    c_sub2.append(OxmlElement('m:sSubPr'))
-    c_e2 = OxmlElement('m:e')
-    c_e2.append(_mr('c', True))
-    c_sub2.append(c_e2)
-    c_s2 = OxmlElement('m:sub')
-    c_s2.append(_msub('m', 'I'))
-    c_s2.append(_mr('(', False))
-    c_s2.append(_mr('k', True))
-    c_s2.append(_mr(')', False))
-    c_sub2.append(c_s2)
+    c_sub2 = _msub_of([_v('c')], [_msub('m', 'I'), _t('('), _v('k'), _t(')')])
 
     _, cur = omath_display(doc, body, cur, [
         _msubsup('p', 'I', 'f'), _t('('), _v('k'), _t(') = (1 + '),
@@ -1835,19 +2010,15 @@ def write_equilibrium_properties(doc, body, hmap, demand_data):
 
     # Clear content between section 4 heading (was v8 "2") and section 5 heading (was v8 "3")
     # Also remove the old Make-or-Buy heading and its content
-    all_now = list(body)
     s4 = hmap['2']
     s4_old_next = hmap['4']  # old calibration heading (now renumbered to 6)
-    s4i = all_now.index(s4)
-    s4_next_i = all_now.index(s4_old_next)
     # Remove everything from after Section 4 heading to before old Calibration heading
     # This removes both old Section 4 content AND old Section 5 (Make-or-Buy) heading+content
-    for el in all_now[s4i + 1:s4_next_i]:
-        body.remove(el)
+    _remove_between(body, s4, s4_old_next)
     cur = s4
 
     # Also rename the heading text from "Comparative Advantage" to "Equilibrium Properties"
-    for t in s4.findall(f'.//{qn("w:t")}'):
+    for t in s4.findall(_Q_W_T_ALL):
         if t.text and 'Comp' in t.text:
             t.text = t.text.replace('Comparative Advantage', 'Equilibrium Properties').replace(' Results', '')
             break
@@ -1861,9 +2032,7 @@ def write_equilibrium_properties(doc, body, hmap, demand_data):
 
     # Proposition 1: Country taxonomy (5-regime version)
     p, cur = mkp(doc, body, cur, space_before=6)
-    r = p.add_run('Proposition 1 (Country Taxonomy). ')
-    r.bold = True
-    r.italic = True
+    add_run_styled(p, 'Proposition 1 (Country Taxonomy). ', bold=True, italic=True)
     p.add_run(
         'With two service types (training with '
     )
@@ -1957,9 +2126,7 @@ def write_equilibrium_properties(doc, body, hmap, demand_data):
 
     # Proposition 2: Concentration
     p, cur = mkp(doc, body, cur, space_before=6)
-    r = p.add_run('Proposition 2 (Capacity Constraints Reduce Concentration). ')
-    r.bold = True
-    r.italic = True
+    add_run_styled(p, 'Proposition 2 (Capacity Constraints Reduce Concentration). ', bold=True, italic=True)
     p.add_run(
         'Define the Herfindahl\u2013Hirschman Index (HHI), '
         'a standard measure of market concentration equal to the sum of squared market shares'
@@ -1969,7 +2136,7 @@ def write_equilibrium_properties(doc, body, hmap, demand_data):
                   '1/N (equal division among N producers) to 1 (a single producer captures '
                   'the entire market). Values above 0.25 indicate high concentration. '
                   'The index is used by the U.S. Department of Justice and Federal Trade '
-                  'Commission to screen mergers and assess market power.', 11)
+                  'Commission to screen mergers and assess market power.')
     p.add_run(', for training market concentration as ')
     omath(p, [_msub('HHI', 'T'), _t(' = '),
               _nary('\u2211', [_v('j')], [],
@@ -2003,9 +2170,7 @@ def write_equilibrium_properties(doc, body, hmap, demand_data):
 
     # Proposition 3: Sovereignty threshold
     p, cur = mkp(doc, body, cur, space_before=6)
-    r = p.add_run('Proposition 3 (Sovereignty Switching Threshold). ')
-    r.bold = True
-    r.italic = True
+    add_run_styled(p, 'Proposition 3 (Sovereignty Switching Threshold). ', bold=True, italic=True)
     p.add_run(
         'A country will bear the additional cost of domestic AI training only if its sovereignty '
         'premium is large enough to justify the price premium over cheaper foreign producers. '
@@ -2042,9 +2207,7 @@ def write_equilibrium_properties(doc, body, hmap, demand_data):
 
     # Proposition 4: Shadow value
     p, cur = mkp(doc, body, cur, space_before=6)
-    r = p.add_run('Proposition 4 (Shadow Value and Grid Expansion). ')
-    r.bold = True
-    r.italic = True
+    add_run_styled(p, 'Proposition 4 (Shadow Value and Grid Expansion). ', bold=True, italic=True)
     p.add_run(
         'For a capacity-constrained exporter, the shadow value '
     )
@@ -2063,9 +2226,7 @@ def write_equilibrium_properties(doc, body, hmap, demand_data):
 
     # Proposition 5: Nesting
     p, cur = mkp(doc, body, cur, space_before=6)
-    r = p.add_run('Proposition 5 (Training Exporters Nest Within Inference Exporters). ')
-    r.bold = True
-    r.italic = True
+    add_run_styled(p, 'Proposition 5 (Training Exporters Nest Within Inference Exporters). ', bold=True, italic=True)
     p.add_run(
         'If a country is cheap enough to export training (which can be done from anywhere), '
         'it is also cheap enough to export inference to nearby demand centers. '
@@ -2117,8 +2278,6 @@ def write_data_section(doc, body, hmap, demand_data):
         'Peak summer temperature is computed from ERA5 reanalysis data '
         '(Hersbach et al. 2020) as the average monthly maximum in the three warmest months, '
         'aggregated across populated grid cells. '
-    )
-    p.add_run(
         'Construction costs per watt of IT capacity are from the Turner & Townsend '
         'Data Centre Construction Cost Index 2025 (Turner & Townsend 2025), for 37 '
         'countries. For the remaining countries, costs are predicted using a log-linear '
@@ -2133,7 +2292,7 @@ def write_data_section(doc, body, hmap, demand_data):
                   'Nigeria, Norway, Poland, Portugal, Saudi Arabia, Singapore, South Africa, South Korea, '
                   'Spain, Sweden, Switzerland, UAE, UK, Uruguay, and USA. '
                   'The 95% prediction intervals for imputed countries span about \u00b1$3.50/W, '
-                  'which translates to \u00b1$0.02/hr in total cost (1.5\u20132% of the mean).', 12)
+                  'which translates to \u00b1$0.02/hr in total cost (1.5\u20132% of the mean).')
 
     p, cur = mkp(doc, body, cur)
     add_italic(p, 'Latency. ')
@@ -2213,8 +2372,7 @@ def write_data_section(doc, body, hmap, demand_data):
         'conversion rates by 8.4%.'
     )
     make_footnote(p, 'The Deloitte (2020) estimate is based on 30 million user sessions across '
-                  'multiple retail and travel sites.',
-                  14)
+                  'multiple retail and travel sites.')
     p.add_run(
         ' The sovereignty premium is '
     )
@@ -2226,7 +2384,7 @@ def write_data_section(doc, body, hmap, demand_data):
     )
     make_footnote(p, 'The 10% sovereignty premium is conservative. Survey evidence on data '
                   'localization suggests enterprises pay 15\u201330% more for guaranteed domestic '
-                  'data residency (UNCTAD 2025).', 15)
+                  'data residency (UNCTAD 2025).')
 
     # Reliability index
     p, cur = mkp(doc, body, cur)
@@ -2301,19 +2459,15 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
 
     sec7 = hmap['4']
     sec8 = hmap['5']
-    all_now = list(body)
-    s7i = all_now.index(sec7)
-    s8i = all_now.index(sec8)
-    for el in all_now[s7i + 1:s8i]:
-        body.remove(el)
+    _remove_between(body, sec7, sec8)
     cur = sec7
+    iso_name = {r["iso3"]: r["country"] for r in cal}
 
     # Introductory paragraph with explanation of costs
     p, cur = mkp(doc, body, cur)
     p.add_run('The model is calibrated for ')
     omath(p, [_v('N'), _t(f' = {n_total}')])
-    p.add_run(f' countries ({n_eca} in ECA, {n_total - n_eca} non-ECA comparators). ')
-    p.add_run('The unit cost ')
+    p.add_run(f' countries ({n_eca} in ECA, {n_total - n_eca} non-ECA comparators). The unit cost ')
     omath(p, [_msub('c', 'j')])
     p.add_run(
         ' represents the total hourly cost of operating one GPU in country '
@@ -2347,7 +2501,7 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
                   'countries are unchanged and the maximum rank shift is six positions. Gulf states and '
                   'North Africa gain the most (UAE moves from 26th to 20th, Qatar from 15th to 11th), '
                   'but the effect is small because electricity prices, not cooling, dominate '
-                  'cross-country cost variation.', 13)
+                  'cross-country cost variation.')
 
     # Main result — reliability-adjusted ranking (preferred specification)
     _xi_adj = demand_data.get("xi_adjusted", {})
@@ -2420,9 +2574,7 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
         'the calibration replaces subsidized tariffs with cost-recovery prices, defined as the '
         'long-run marginal cost (LRMC) of the dominant generation technology at '
         'opportunity-cost fuel prices (IMF 2025, Lazard 2025). This adjustment is applied to '
-    )
-    p.add_run(f'{demand_data["n_adjusted"]} countries')
-    p.add_run(
+        f'{demand_data["n_adjusted"]} countries'
         ' whose retail electricity prices fall below the estimated LRMC. '
         'Hydropower producers (Kyrgyzstan, Canada, Norway) are not adjusted because their '
         'low prices reflect genuine resource advantages rather than fiscal transfers. '
@@ -2523,10 +2675,10 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
         f'(HHI = {cap_hhi:.2f}), confirming Proposition 2. '
     )
     if mu_vals:
-        top_mu = sorted(mu_vals.items(), key=lambda x: -x[1])[:3]
+        top_mu = heapq.nlargest(3, mu_vals.items(), key=itemgetter(1))
         mu_labels = []
         for iso, mu in top_mu:
-            co = next((r["country"] for r in cal if r["iso3"] == iso), iso)
+            co = iso_name.get(iso, iso)
             mu_labels.append(f'{co} (${mu:.3f}/hr)')
         p.add_run(
             'The largest shadow values of grid capacity are '
@@ -2534,11 +2686,11 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
             'consistent with Proposition 4. '
         )
     # Top inference exporters
-    top_inf = sorted(ir.items(), key=lambda x: -x[1])
-    top5_inf = top_inf[:5]
+    ir_sorted = sorted(ir.items(), key=lambda x: -x[1])
+    top5_inf = ir_sorted[:5]
     inf_labels = []
     for iso, share in top5_inf:
-        co = next(r["country"] for r in cal if r["iso3"] == iso)
+        co = iso_name[iso]
         inf_labels.append(f'{co} ({share * 100:.0f}%)')
     p.add_run(
         'Inference is more dispersed, with the top five suppliers being '
@@ -2556,10 +2708,8 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
     kgz_clients = demand_data["kgz_inf_clients"]
     kgz_total = sum(w for _, _, w in kgz_clients)
     if kgz_total > 0:
-        kgz_client_names = [
-            co for _, co, _ in sorted(kgz_clients, key=lambda x: -x[2])
-            if co != "Kyrgyzstan"]
-        names = kgz_client_names[:3]
+        names = [co for _, co, _ in heapq.nlargest(
+            3, (c for c in kgz_clients if c[1] != "Kyrgyzstan"), key=itemgetter(2))]
         if len(names) <= 2:
             kgz_list = " and ".join(names)
         else:
@@ -2572,14 +2722,14 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
     # Find the largest non-self developing-country inference exporter besides KGZ
     _dev = {'DZA', 'KGZ', 'ETH', 'EGY', 'KOS', 'XKX', 'TKM', 'UZB', 'TJK',
             'ALB', 'MKD', 'GEO', 'ARM', 'MDA', 'UKR', 'BIH', 'SRB'}
-    for _iso, _share in sorted(ir.items(), key=lambda x: -x[1]):
+    # Number of other countries each inference source serves
+    served_by = Counter(
+        r["best_inf_source"] for i, r in demand_data.get("adj_reg", {}).items()
+        if r["best_inf_source"] != i)
+    for _iso, _share in ir_sorted:
         if _iso in _dev and _iso != 'KGZ' and _share > 0.01:
-            _co = next((r["country"] for r in cal if r["iso3"] == _iso), _iso)
-            # Count how many countries this hub serves
-            _n_served = sum(
-                1 for i in demand_data.get("adj_reg", {})
-                if demand_data["adj_reg"][i]["best_inf_source"] == _iso
-                and i != _iso)
+            _co = iso_name.get(_iso, _iso)
+            _n_served = served_by[_iso]
             if _n_served > 0:
                 p.add_run(
                     f'{_co} serves as an inference hub for {_n_served} '
@@ -2652,32 +2802,32 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
     p, cur = mkp(doc, body, cur)
     add_italic(p, 'Major demand centers. ')
     ar = demand_data.get("adj_reg", {})
-    _iso_name = {r["iso3"]: r["country"] for r in cal}
-    usa_inf = ar.get('USA', {}).get('best_inf_source', 'CAN')
-    usa_inf_cost = ar.get('USA', {}).get('best_inf_cost', '1.190')
-    deu_inf = ar.get('DEU', {}).get('best_inf_source', 'KOS')
-    deu_inf_cost = ar.get('DEU', {}).get('best_inf_cost', '1.180')
-    gbr_inf = ar.get('GBR', {}).get('best_inf_source', 'GBR')
-    gbr_inf_cost = ar.get('GBR', {}).get('best_inf_cost', '1.176')
-    fra_inf = ar.get('FRA', {}).get('best_inf_source', 'FRA')
-    fra_inf_cost = ar.get('FRA', {}).get('best_inf_cost', '1.174')
-    chn_inf = ar.get('CHN', {}).get('best_inf_source', 'KGZ')
-    chn_inf_cost = ar.get('CHN', {}).get('best_inf_cost', '1.161')
+    usa_r, deu_r, gbr_r, fra_r, chn_r = (ar.get(k, {}) for k in ('USA', 'DEU', 'GBR', 'FRA', 'CHN'))
+    usa_inf = usa_r.get('best_inf_source', 'CAN')
+    usa_inf_cost = float(usa_r.get('best_inf_cost', '1.190'))
+    deu_inf = deu_r.get('best_inf_source', 'KOS')
+    deu_inf_cost = float(deu_r.get('best_inf_cost', '1.180'))
+    gbr_inf = gbr_r.get('best_inf_source', 'GBR')
+    gbr_inf_cost = float(gbr_r.get('best_inf_cost', '1.176'))
+    fra_inf = fra_r.get('best_inf_source', 'FRA')
+    fra_inf_cost = float(fra_r.get('best_inf_cost', '1.174'))
+    chn_inf = chn_r.get('best_inf_source', 'KGZ')
+    chn_inf_cost = float(chn_r.get('best_inf_cost', '1.161'))
     p.add_run(
         'The model\u2019s predictions vary across major AI demand centers because '
         'each faces a different latency geography. '
         'For the United States, the cost-recovery optimum sources training from the cheapest '
         'available producer and inference from '
-        f'{_iso_name.get(usa_inf, usa_inf)} (${float(usa_inf_cost):.2f}/hr). '
+        f'{iso_name.get(usa_inf, usa_inf)} (${usa_inf_cost:.2f}/hr). '
         'For Germany, inference is sourced from '
-        f'{_iso_name.get(deu_inf, deu_inf)} '
-        f'(${float(deu_inf_cost):.2f}/hr), '
-        f'for the United Kingdom from {_iso_name.get(gbr_inf, gbr_inf)} '
-        f'(${float(gbr_inf_cost):.2f}/hr), '
-        f'and for France from {_iso_name.get(fra_inf, fra_inf)} '
-        f'(${float(fra_inf_cost):.2f}/hr). '
-        f'For China, the cheapest inference source is {_iso_name.get(chn_inf, chn_inf)} '
-        f'(${float(chn_inf_cost):.2f}/hr), a bordering country with hydropower-based electricity. '
+        f'{iso_name.get(deu_inf, deu_inf)} '
+        f'(${deu_inf_cost:.2f}/hr), '
+        f'for the United Kingdom from {iso_name.get(gbr_inf, gbr_inf)} '
+        f'(${gbr_inf_cost:.2f}/hr), '
+        f'and for France from {iso_name.get(fra_inf, fra_inf)} '
+        f'(${fra_inf_cost:.2f}/hr). '
+        f'For China, the cheapest inference source is {iso_name.get(chn_inf, chn_inf)} '
+        f'(${chn_inf_cost:.2f}/hr), a bordering country with hydropower-based electricity. '
         'These patterns illustrate the model\u2019s core prediction that inference organizes around '
         'latency-bounded regional hubs, and each major market has a distinct optimal supplier '
         'determined by geography. '
@@ -2771,8 +2921,7 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
     make_footnote(p,
                   'The IMF estimates global fossil fuel subsidies at $6.7 trillion in 2024. '
                   'Explicit subsidies (below-cost pricing) account for 8%; the remainder reflects '
-                  'unpriced environmental costs. This paper uses only the explicit component.',
-                  16)
+                  'unpriced environmental costs. This paper uses only the explicit component.')
     p.add_run(
         ' The subsidy gap ranges from '
         f'${demand_data["min_gap_mwh"] / 1000:.3f} to ${demand_data["max_gap_mwh_val"] / 1000:.3f}/kWh. '
@@ -2816,8 +2965,7 @@ def write_calibration(doc, body, hmap, cal, reg, n_eca, n_total, all_reg, all_so
     make_footnote(p,
                   'Kyrgyzstan already experiences seasonal power shortages when reservoir '
                   'levels fall. Adding several hundred MW of year-round base load would '
-                  'exacerbate this constraint.',
-                  17)
+                  'exacerbate this constraint.')
     p.add_run(
         ' The capacity ceiling '
     )
@@ -2904,11 +3052,7 @@ def write_conclusion(doc, body, hmap, demand_data):
     print("Rewriting Section 7 (Conclusion)...")
     sec8 = hmap['5']
     refs = hmap['refs']
-    all_now = list(body)
-    c8i = all_now.index(sec8)
-    ri = all_now.index(refs)
-    for el in all_now[c8i + 1:ri]:
-        body.remove(el)
+    _remove_between(body, sec8, refs)
 
     p, cur_concl = mkp(doc, body, sec8)
     p.add_run(
@@ -2980,62 +3124,38 @@ def write_conclusion(doc, body, hmap, demand_data):
     )
 
 
+# Appendix section breaks: US Letter page, 1-inch margins, 0.5-inch header/footer
+_PG_MAR_XML = ('<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440"'
+               ' w:header="720" w:footer="720"/>')
+_PORTRAIT_SECTPR = parse_xml(
+    f'<w:sectPr {nsdecls("w")}><w:pgSz w:w="12240" w:h="15840"/>{_PG_MAR_XML}</w:sectPr>')
+_LANDSCAPE_SECTPR = parse_xml(
+    f'<w:sectPr {nsdecls("w")}><w:pgSz w:w="15840" w:h="12240" w:orient="landscape"/>'
+    f'{_PG_MAR_XML}</w:sectPr>')
+
+
+def add_section_break(doc, after_el, sect_pr):
+    """Insert an empty paragraph after after_el that ends a section laid out as sect_pr."""
+    p = new_paragraph(doc)
+    p.paragraph_format.space_before = _PT_0
+    p.paragraph_format.space_after = _PT_0
+    p_el = p._element
+    after_el.addnext(p_el)
+    p_el.get_or_add_pPr().append(copy.deepcopy(sect_pr))
+    return p_el
+
+
 def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_data):
     print("Inserting Appendix (Table A2)...")
 
     # ─── Portrait section break (ends portrait section, next page stays portrait) ───
-    sep = doc.add_paragraph()
-    sep.paragraph_format.space_before = Pt(0)
-    sep.paragraph_format.space_after = Pt(0)
-    sep_el = sep._element
-    body.remove(sep_el)
-    last_ref_el.addnext(sep_el)
-    sect_portrait = OxmlElement('w:sectPr')
-    pg_sz_p = OxmlElement('w:pgSz')
-    pg_sz_p.set(qn('w:w'), '12240')   # 8.5 inches
-    pg_sz_p.set(qn('w:h'), '15840')   # 11 inches
-    sect_portrait.append(pg_sz_p)
-    pg_mar_p = OxmlElement('w:pgMar')
-    pg_mar_p.set(qn('w:top'), '1440')
-    pg_mar_p.set(qn('w:right'), '1440')
-    pg_mar_p.set(qn('w:bottom'), '1440')
-    pg_mar_p.set(qn('w:left'), '1440')
-    pg_mar_p.set(qn('w:header'), '720')
-    pg_mar_p.set(qn('w:footer'), '720')
-    sect_portrait.append(pg_mar_p)
-    sep_pPr = sep_el.find(f'{{{W_NS}}}pPr')
-    if sep_pPr is None:
-        sep_pPr = etree.SubElement(sep_el, f'{{{W_NS}}}pPr')
-    sep_pPr.append(sect_portrait)
+    sep_el = add_section_break(doc, last_ref_el, _PORTRAIT_SECTPR)
 
     # Appendix heading (portrait page)
     cur_app = mkh(doc, body, sep_el, 'Appendix', level=1)
 
     # ─── Portrait section break (ends portrait for landscape Table A2) ───
-    hr_a1 = doc.add_paragraph()
-    hr_a1.paragraph_format.space_before = Pt(0)
-    hr_a1.paragraph_format.space_after = Pt(0)
-    hr_a1_el = hr_a1._element
-    body.remove(hr_a1_el)
-    cur_app.addnext(hr_a1_el)
-
-    sect_a1_end = OxmlElement('w:sectPr')
-    pg_sz_a1 = OxmlElement('w:pgSz')
-    pg_sz_a1.set(qn('w:w'), '12240')
-    pg_sz_a1.set(qn('w:h'), '15840')
-    sect_a1_end.append(pg_sz_a1)
-    pg_mar_a1 = OxmlElement('w:pgMar')
-    pg_mar_a1.set(qn('w:top'), '1440')
-    pg_mar_a1.set(qn('w:right'), '1440')
-    pg_mar_a1.set(qn('w:bottom'), '1440')
-    pg_mar_a1.set(qn('w:left'), '1440')
-    pg_mar_a1.set(qn('w:header'), '720')
-    pg_mar_a1.set(qn('w:footer'), '720')
-    sect_a1_end.append(pg_mar_a1)
-    hr_a1_pPr = hr_a1_el.find(f'{{{W_NS}}}pPr')
-    if hr_a1_pPr is None:
-        hr_a1_pPr = etree.SubElement(hr_a1_el, f'{{{W_NS}}}pPr')
-    hr_a1_pPr.append(sect_a1_end)
+    hr_a1_el = add_section_break(doc, cur_app, _PORTRAIT_SECTPR)
 
     # ═══════════════════════════════════════════════════════════════════════
     # TABLE A2: COUNTRY-SPECIFIC CALIBRATION PARAMETERS (landscape)
@@ -3043,25 +3163,25 @@ def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_dat
     print("Inserting Table A2 (Country parameters, landscape)...")
 
     # Table A2 title with bookmark + back-link (follows directly after A1 notes)
-    tp2 = doc.add_paragraph()
-    tp2.paragraph_format.space_before = Pt(6)
-    tp2.paragraph_format.space_after = Pt(3)
-    tp2.paragraph_format.first_line_indent = Inches(0)
+    tp2 = new_paragraph(doc)
+    tp2.paragraph_format.space_before = _PT_6
+    tp2.paragraph_format.space_after = _PT_3
+    tp2.paragraph_format.first_line_indent = _IN_0
     tp2._element.append(make_bookmark(104, 'TableA2'))
     hl_t = OxmlElement('w:hyperlink')
-    hl_t.set(qn('w:anchor'), 'TableA2txt')
-    hl_t.set(qn('w:history'), '1')
+    hl_t.set(_Q_W_ANCHOR, 'TableA2txt')
+    hl_t.set(_Q_W_HISTORY, '1')
     r_t = OxmlElement('w:r')
     rPr_t = OxmlElement('w:rPr')
     b_t = OxmlElement('w:b')
     rPr_t.append(b_t)
     sz_t = OxmlElement('w:sz')
-    sz_t.set(qn('w:val'), '20')
+    sz_t.set(_Q_W_VAL, '20')
     rPr_t.append(sz_t)
     clr_t = OxmlElement('w:color')
-    clr_t.set(qn('w:val'), LINK_COLOR)
+    clr_t.set(_Q_W_VAL, LINK_COLOR)
     uu_t = OxmlElement('w:u')
-    uu_t.set(qn('w:val'), 'single')
+    uu_t.set(_Q_W_VAL, 'single')
     rPr_t.append(clr_t)
     rPr_t.append(uu_t)
     r_t.append(rPr_t)
@@ -3071,11 +3191,8 @@ def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_dat
     hl_t.append(r_t)
     tp2._element.append(hl_t)
     tp2._element.append(make_bookmark_end(104))
-    run_tt2 = tp2.add_run('. Country-specific calibration parameters')
-    run_tt2.bold = True
-    run_tt2.font.size = Pt(10)
+    add_run_styled(tp2, '. Country-specific calibration parameters', bold=True, size=_PT_10)
     tp2_el = tp2._element
-    body.remove(tp2_el)
     hr_a1_el.addnext(tp2_el)
 
     # Gather all country data
@@ -3093,6 +3210,8 @@ def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_dat
                   "c\u2c7c\n($/hr)", "Cost-Rec.\np\u1d31 ($/kWh)", "Regime"]
 
     # Build row data; track which rows need bold in cost-recovery column
+    regime_short = {"full import": "import", "import training + build inference": "hybrid",
+                    "full domestic": "domestic"}
     a2_rows = []
     bold_cr_rows = []  # row indices (0-based) where cost-rec price is substituted
     for idx, r_row in enumerate(all_cal):
@@ -3102,8 +3221,7 @@ def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_dat
             co = co[:19] + "."
         adj_rank = adj_rank_map.get(iso, 999)
         regime = reg.get(iso, {}).get("regime", "full import")
-        rs = {"full import": "import", "import training + build inference": "hybrid",
-              "full domestic": "domestic"}.get(regime, regime)
+        rs = regime_short.get(regime, regime)
         # Cost-recovery price: substituted value for 13 countries, otherwise same as p_E
         p_E_raw = float(r_row["p_E_usd_kwh"])
         cr = SUBSIDY_ADJ.get(iso)
@@ -3134,15 +3252,15 @@ def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_dat
 
     # Post-process: bold the cost-recovery price cells for subsidized countries
     # Table rows: row 0 = header, data rows start at 1
-    all_trs = last_a2_tbl.findall(f'{{{W_NS}}}tr')
+    all_trs = last_a2_tbl.findall(_Q_W_TR)
     for row_idx in bold_cr_rows:
         tr = all_trs[row_idx + 1]  # skip header row
         # Column 10 = cost-recovery price
-        tcs = tr.findall(f'{{{W_NS}}}tc')
+        tcs = tr.findall(_Q_W_TC)
         if len(tcs) > 10:
             tc = tcs[10]
-            for r_el in tc.findall(f'.//{{{W_NS}}}r'):
-                rPr = r_el.find(f'{{{W_NS}}}rPr')
+            for r_el in tc.findall(f'.//{_Q_W_R}'):
+                rPr = r_el.find(_Q_W_RPR)
                 if rPr is None:
                     rPr = OxmlElement('w:rPr')
                     r_el.insert(0, rPr)
@@ -3150,15 +3268,14 @@ def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_dat
                 rPr.append(b_el)
 
     # Table A2 notes
-    note_a2 = doc.add_paragraph()
-    note_a2.paragraph_format.space_before = Pt(4)
-    note_a2.paragraph_format.space_after = Pt(0)
-    note_a2.paragraph_format.first_line_indent = Inches(0)
+    note_a2 = new_paragraph(doc)
+    note_a2.paragraph_format.space_before = _PT_4
+    note_a2.paragraph_format.space_after = _PT_0
+    note_a2.paragraph_format.first_line_indent = _IN_0
     note_a2.paragraph_format.line_spacing = 1.0
-    rn = note_a2.add_run('Notes: ')
-    rn.bold = True
-    rn.font.size = Pt(7.5)
-    rn = note_a2.add_run(
+    add_run_styled(note_a2, 'Notes: ', bold=True, size=_PT_7_5)
+    add_run_styled(
+        note_a2,
         'Countries sorted by cost-recovery adjusted rank (ascending). '
         'p\u1d31 = national electricity price for industrial/data center consumers ($/kWh). '
         '\u03B8\u2c7c = peak summer temperature (\u00b0C). '
@@ -3175,40 +3292,15 @@ def write_appendix(doc, body, last_ref_el, eca_cal, non_eca_cal, reg, demand_dat
         'For 13 countries with subsidized tariffs, this is the estimated long-run marginal cost '
         'of electricity generation (shown in bold). '
         'For all other countries, the cost-recovery price equals the observed tariff. '
-        'Regime = optimal sourcing strategy from equation (4) without sovereignty premium.'
+        'Regime = optimal sourcing strategy from equation (4) without sovereignty premium.',
+        size=_PT_7_5,
     )
-    rn.font.size = Pt(7.5)
     note_a2_el = note_a2._element
-    body.remove(note_a2_el)
     last_a2_tbl.addnext(note_a2_el)
 
-    # Empty paragraph after Table A2 notes (hard return)
-    hr_a2 = doc.add_paragraph()
-    hr_a2.paragraph_format.space_before = Pt(0)
-    hr_a2.paragraph_format.space_after = Pt(0)
-    hr_a2_el = hr_a2._element
-    body.remove(hr_a2_el)
-    note_a2_el.addnext(hr_a2_el)
-
-    # Landscape section break (on empty paragraph, ends landscape for portrait Appendix B)
-    sect_pr = OxmlElement('w:sectPr')
-    pg_sz = OxmlElement('w:pgSz')
-    pg_sz.set(qn('w:w'), '15840')
-    pg_sz.set(qn('w:h'), '12240')
-    pg_sz.set(qn('w:orient'), 'landscape')
-    sect_pr.append(pg_sz)
-    pg_mar = OxmlElement('w:pgMar')
-    pg_mar.set(qn('w:top'), '1440')
-    pg_mar.set(qn('w:right'), '1440')
-    pg_mar.set(qn('w:bottom'), '1440')
-    pg_mar.set(qn('w:left'), '1440')
-    pg_mar.set(qn('w:header'), '720')
-    pg_mar.set(qn('w:footer'), '720')
-    sect_pr.append(pg_mar)
-    hr_a2_pPr = hr_a2_el.find(f'{{{W_NS}}}pPr')
-    if hr_a2_pPr is None:
-        hr_a2_pPr = etree.SubElement(hr_a2_el, f'{{{W_NS}}}pPr')
-    hr_a2_pPr.append(sect_pr)
+    # Empty paragraph after Table A2 notes (hard return) carrying the landscape
+    # section break (ends landscape for portrait Appendix B)
+    hr_a2_el = add_section_break(doc, note_a2_el, _LANDSCAPE_SECTPR)
 
     return hr_a2_el
 
@@ -3257,7 +3349,7 @@ def write_model_appendix(doc, body, last_note):
 
     # B.2 Training Market
     cur = mkh(doc, body, cur, 'B.2 The Training Market', level=2)
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run('Country ')
     omath(p, [_v('k')])
     p.add_run(' imports training if and only if ')
@@ -3276,7 +3368,6 @@ def write_model_appendix(doc, body, last_note):
     )
     omath(p, [_msub('m', 'T')])
     p.add_run(' is defined by:')
-    p.paragraph_format.space_after = Pt(2)
 
     _, cur = omath_display(doc, body, cur, [
         _msub('m', 'T'), _t(' = min { '), _v('m'),
@@ -3302,7 +3393,7 @@ def write_model_appendix(doc, body, last_note):
 
     # B.3 Inference Market
     cur = mkh(doc, body, cur, 'B.3 The Inference Market', level=2)
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run('The feasible supplier set for demand center ')
     omath(p, [_v('k')])
     p.add_run(' is ')
@@ -3313,7 +3404,6 @@ def write_model_appendix(doc, body, last_note):
     p.add_run(' to ')
     omath(p, [_v('k')])
     p.add_run(' is:')
-    p.paragraph_format.space_after = Pt(2)
 
     _, cur = omath_display(doc, body, cur, [
         _msub('MC', 'I'), _t('('), _v('j'), _t(', '), _v('k'),
@@ -3333,7 +3423,7 @@ def write_model_appendix(doc, body, last_note):
 
     # B.4 Capacity Allocation
     cur = mkh(doc, body, cur, 'B.4 Capacity Allocation', level=2)
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run(
         'Each GPU-hour is allocated to its highest-margin use. The margins per GPU-hour are: '
         'training exports '
@@ -3352,7 +3442,6 @@ def write_model_appendix(doc, body, last_note):
     )
     omath(p, [_msub('K', 'j')])
     p.add_run(' GPU-hours is:')
-    p.paragraph_format.space_after = Pt(2)
 
     _, cur = omath_display(doc, body, cur, [
         _msub('\u03A0', 'j'), _t('('), _msub('K', 'j'),
@@ -3400,9 +3489,8 @@ def write_model_appendix(doc, body, last_note):
 
     # B.6 Welfare (was B.7)
     cur = mkh(doc, body, cur, 'B.6 Welfare Cost of Sovereignty', level=2)
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run('The welfare cost has two components. Import markup:')
-    p.paragraph_format.space_after = Pt(2)
 
     _, cur = omath_display(doc, body, cur, [
         _msub('DWL', 'import'), _t(' = '),
@@ -3411,9 +3499,8 @@ def write_model_appendix(doc, body, last_note):
                _t(' \u00b7 '), _msub('p', 'T')]), _t('.'),
     ], eq_num='B.4')
 
-    p, cur = mkp(doc, body, cur)
+    p, cur = mkp(doc, body, cur, space_after=2)
     p.add_run('Allocative inefficiency:')
-    p.paragraph_format.space_after = Pt(2)
 
     _, cur = omath_display(doc, body, cur, [
         _msub('DWL', 'alloc'), _t(' = '),
@@ -3496,20 +3583,20 @@ def write_sensitivity_appendix(doc, body, last_el, demand_data):
     )
 
     # Notes paragraph
-    note = doc.add_paragraph()
-    note.paragraph_format.space_before = Pt(2)
-    note.paragraph_format.space_after = Pt(0)
-    note.paragraph_format.first_line_indent = Inches(0)
-    rn = note.add_run(
+    note = new_paragraph(doc)
+    note.paragraph_format.space_before = _PT_2
+    note.paragraph_format.space_after = _PT_0
+    note.paragraph_format.first_line_indent = _IN_0
+    add_run_styled(
+        note,
         'Notes: Each row re-solves the capacity-constrained equilibrium under the stated '
         'parameter change. Spearman \u03c1 is the rank correlation of country-level training costs '
         'with the baseline ordering. Top 5 indicates whether the five cheapest countries '
         'remain the same set in the same order. HHI is the Herfindahl\u2013Hirschman Index '
-        'of export concentration.'
+        'of export concentration.',
+        size=_PT_7_5,
     )
-    rn.font.size = Pt(7.5)
     note_el = note._element
-    body.remove(note_el)
     tbl_el.addnext(note_el)
 
     return note_el
@@ -3662,19 +3749,19 @@ def write_kyrgyzstan_appendix(doc, body, last_el):
                        title='Table A4. Facility specification')
 
     # WACC note
-    p = doc.add_paragraph()
-    p.paragraph_format.space_before = Pt(2)
-    p.paragraph_format.space_after = Pt(4)
-    p.paragraph_format.first_line_indent = Inches(0)
-    rn = p.add_run(
+    p = new_paragraph(doc)
+    p.paragraph_format.space_before = _PT_2
+    p.paragraph_format.space_after = _PT_4
+    p.paragraph_format.first_line_indent = _IN_0
+    add_run_styled(
+        p,
         f'Notes: WACC = {ESHARE:.0%} \u00d7 {COE:.0%} (cost of equity) '
         f'+ {DSHARE:.0%} \u00d7 {COD:.0%} \u00d7 (1 \u2212 {TAX_R:.0%}) (after-tax debt) '
         f'= {WACC:.1%}. Cost of equity includes a {CRP:.0%} country risk premium and '
-        f'{ERP:.0%} emerging-market equity premium over the {RF:.0%} risk-free rate.'
+        f'{ERP:.0%} emerging-market equity premium over the {RF:.0%} risk-free rate.',
+        size=_PT_7_5,
     )
-    rn.font.size = Pt(7.5)
     wacc_el = p._element
-    body.remove(wacc_el)
     tbl_a4.addnext(wacc_el)
     cur = wacc_el
 
@@ -3707,10 +3794,10 @@ def write_kyrgyzstan_appendix(doc, body, last_el):
                        title='Table A5. Year-by-year cash flow ($ millions)')
 
     # ── Key metrics paragraph ─────────────────────────────────────────────
-    p = doc.add_paragraph()
-    p.paragraph_format.space_before = Pt(6)
-    p.paragraph_format.space_after = Pt(4)
-    p.paragraph_format.first_line_indent = Inches(0)
+    p = new_paragraph(doc)
+    p.paragraph_format.space_before = _PT_6
+    p.paragraph_format.space_after = _PT_4
+    p.paragraph_format.first_line_indent = _IN_0
     p.add_run(
         f'The project yields an NPV of ${npv/1e6:,.0f}M at a {WACC:.1%} WACC, '
         f'an IRR of {irr:.1%}, and a simple payback in year\u2009{payback}. '
@@ -3719,7 +3806,6 @@ def write_kyrgyzstan_appendix(doc, body, last_el):
         f'and electricity represents {tot_elec/tot_ox:.0%} of operating costs.'
     )
     met_el = p._element
-    body.remove(met_el)
     tbl_a5.addnext(met_el)
     cur = met_el
 
@@ -3749,12 +3835,11 @@ def write_kyrgyzstan_appendix(doc, body, last_el):
                        title='Table A6. Sensitivity of investment returns to parameter variation')
 
     # ── Risks paragraph ───────────────────────────────────────────────────
-    p = doc.add_paragraph()
-    p.paragraph_format.space_before = Pt(6)
-    p.paragraph_format.space_after = Pt(4)
-    p.paragraph_format.first_line_indent = Inches(0)
-    r = p.add_run('Risks. ')
-    r.bold = True
+    p = new_paragraph(doc)
+    p.paragraph_format.space_before = _PT_6
+    p.paragraph_format.space_after = _PT_4
+    p.paragraph_format.first_line_indent = _IN_0
+    add_run_styled(p, 'Risks. ', bold=True)
     p.add_run(
         'Kyrgyzstan depends on the Toktogul reservoir for over 80% of electricity; '
         'seasonal drawdowns and drought years create acute power shortages. '
@@ -3767,7 +3852,6 @@ def write_kyrgyzstan_appendix(doc, body, last_el):
         'perturbations in Table\u2009A6.'
     )
     risk_el = p._element
-    body.remove(risk_el)
     tbl_a6.addnext(risk_el)
 
     return risk_el
@@ -3828,35 +3912,31 @@ def write_construction_regression_appendix(doc, body, last_el):
     for iso3 in dcci:
         dcci[iso3] = _np.mean(dcci[iso3])
 
-    gdp_d = {}
-    with open(_DATA / "wb_gdp_per_capita_ppp_2023.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            gdp_d[row["iso3"]] = float(row["gdp_pcap_ppp_2023"])
-    reg_d = {}
-    with open(_DATA / "wb_country_regions.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            reg_d[row["iso3"]] = row["region"]
-    urban_d = {}
-    with open(_DATA / "wb_urban_share_2023.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            urban_d[row["iso3"]] = float(row["urban_share_pct"]) / 100.0
-    seismic_d = {}
-    with open(_DATA / "seismic_zones.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            seismic_d[row["iso3"]] = int(row["seismic_high"])
+    gdp_d = read_iso_column(_DATA / "wb_gdp_per_capita_ppp_2023.csv", "gdp_pcap_ppp_2023")
+    reg_d = read_iso_column(_DATA / "wb_country_regions.csv", "region", cast=str)
+    urban_d = {iso3: v / 100.0 for iso3, v in
+               read_iso_column(_DATA / "wb_urban_share_2023.csv", "urban_share_pct").items()}
+    seismic_d = read_iso_column(_DATA / "seismic_zones.csv", "seismic_high", cast=int)
 
     REF_REGION = "Europe & Central Asia"
     DUMMY_REGIONS = sorted(r for r in set(reg_d.values()) if r != REF_REGION)
 
     matched = []
+    gdp_get = gdp_d.get
+    reg_get = reg_d.get
     for iso3, avg_cost in dcci.items():
-        if iso3 in gdp_d and iso3 in reg_d:
-            matched.append({
-                "iso3": iso3, "cost": avg_cost,
-                "gdp_pcap": gdp_d[iso3], "region": reg_d[iso3],
-                "urban_share": urban_d.get(iso3, 0.5),
-                "seismic": seismic_d.get(iso3, 0),
-            })
+        gdp_pcap = gdp_get(iso3)
+        if gdp_pcap is None:
+            continue
+        region = reg_get(iso3)
+        if region is None:
+            continue
+        matched.append({
+            "iso3": iso3, "cost": avg_cost,
+            "gdp_pcap": gdp_pcap, "region": region,
+            "urban_share": urban_d.get(iso3, 0.5),
+            "seismic": seismic_d.get(iso3, 0),
+        })
 
     n = len(matched)
     k = 5 + len(DUMMY_REGIONS)
@@ -3865,10 +3945,7 @@ def write_construction_regression_appendix(doc, body, last_el):
     col_names = ["Intercept", "ln(GDP per capita)", "ln(Population)",
                  "Urban population share",
                  "Seismic zone indicator"] + [r.split(",")[0].strip() for r in DUMMY_REGIONS]
-    pop_d = {}
-    with open(_DATA / "wb_population_2023.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            pop_d[row["iso3"]] = int(row["population_2023"])
+    pop_d = read_iso_column(_DATA / "wb_population_2023.csv", "population_2023", cast=int)
     for i, m in enumerate(matched):
         X[i, 0] = 1.0
         X[i, 1] = _math.log(m["gdp_pcap"])
@@ -3913,25 +3990,34 @@ def write_construction_regression_appendix(doc, body, last_el):
                     title='Table A7. Construction cost regression: ln($/W)')
 
     # Notes paragraph
-    p = doc.add_paragraph()
-    p.paragraph_format.space_before = Pt(2)
-    p.paragraph_format.space_after = Pt(4)
-    p.paragraph_format.first_line_indent = Inches(0)
-    rn = p.add_run(
+    p = new_paragraph(doc)
+    p.paragraph_format.space_before = _PT_2
+    p.paragraph_format.space_after = _PT_4
+    p.paragraph_format.first_line_indent = _IN_0
+    add_run_styled(
+        p,
         f'Notes: OLS regression on {n} countries from the Turner & Townsend DCCI 2025. '
         f'Dependent variable: ln(construction cost in $/W). '
         f'R\u00b2 = {r2:.2f}, adjusted R\u00b2 = {adj_r2:.2f}, RMSE = {rmse:.3f}. '
         f'Reference region: Europe & Central Asia. '
-        f'*** p < 0.01, ** p < 0.05, * p < 0.10.'
+        f'*** p < 0.01, ** p < 0.05, * p < 0.10.',
+        size=_PT_7_5,
     )
-    rn.font.size = Pt(7.5)
     note_el = p._element
-    body.remove(note_el)
     tbl.addnext(note_el)
 
     return note_el
 
 
+@functools.cache
+def _get_plt():
+    """Import pyplot (Agg backend) on first use; only the figure writers need it."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
 def write_figure4b(doc, body, last_ref, demand_data):
     """Generate and embed Figure 1 (reliability rank scatter) after references."""
     print("Embedding Figure 1 (Reliability Rank Scatter)...")
@@ -3959,6 +4045,7 @@ def write_figure4b(doc, body, last_ref, demand_data):
     reg_isos = [iso for iso in common if iso not in DC_ACTIVE]
     act_isos = [iso for iso in common if iso in DC_ACTIVE]
 
+    plt = _get_plt()
     fig, ax = plt.subplots(figsize=(5.5, 5.5))
     # Regular countries: dots
     ax.scatter([baseline_rank[iso] + 1 for iso in reg_isos],
@@ -4019,26 +4106,26 @@ def write_figure4b(doc, body, last_ref, demand_data):
     pb_el = add_page_break(doc, body, last_ref)
 
     # Figure title with bookmark (outside the image)
-    title_p = doc.add_paragraph()
+    title_p = new_paragraph(doc)
     title_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    title_p.paragraph_format.space_before = Pt(6)
-    title_p.paragraph_format.space_after = Pt(4)
-    title_p.paragraph_format.first_line_indent = Inches(0)
+    title_p.paragraph_format.space_before = _PT_6
+    title_p.paragraph_format.space_after = _PT_4
+    title_p.paragraph_format.first_line_indent = _IN_0
     title_p._element.append(make_bookmark(120, 'Figure1'))
     hl_f1 = OxmlElement('w:hyperlink')
-    hl_f1.set(qn('w:anchor'), 'Figure1txt')
-    hl_f1.set(qn('w:history'), '1')
+    hl_f1.set(_Q_W_ANCHOR, 'Figure1txt')
+    hl_f1.set(_Q_W_HISTORY, '1')
     r_f1 = OxmlElement('w:r')
     rPr_f1 = OxmlElement('w:rPr')
     b_f1 = OxmlElement('w:b')
     rPr_f1.append(b_f1)
     sz_f1 = OxmlElement('w:sz')
-    sz_f1.set(qn('w:val'), '20')
+    sz_f1.set(_Q_W_VAL, '20')
     rPr_f1.append(sz_f1)
     clr_f1 = OxmlElement('w:color')
-    clr_f1.set(qn('w:val'), LINK_COLOR)
+    clr_f1.set(_Q_W_VAL, LINK_COLOR)
     uu_f1 = OxmlElement('w:u')
-    uu_f1.set(qn('w:val'), 'single')
+    uu_f1.set(_Q_W_VAL, 'single')
     rPr_f1.append(clr_f1)
     rPr_f1.append(uu_f1)
     r_f1.append(rPr_f1)
@@ -4048,35 +4135,30 @@ def write_figure4b(doc, body, last_ref, demand_data):
     hl_f1.append(r_f1)
     title_p._element.append(hl_f1)
     title_p._element.append(make_bookmark_end(120))
-    run_ft = title_p.add_run('. Rank change with reliability adjustment')
-    run_ft.bold = True
-    run_ft.font.size = Pt(10)
+    add_run_styled(title_p, '. Rank change with reliability adjustment', bold=True, size=_PT_10)
     title_el = title_p._element
-    body.remove(title_el)
     pb_el.addnext(title_el)
 
     # Embed image
-    pic_p = doc.add_paragraph()
+    pic_p = new_paragraph(doc)
     pic_p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    pic_p.paragraph_format.space_before = Pt(4)
-    pic_p.paragraph_format.space_after = Pt(4)
+    pic_p.paragraph_format.space_before = _PT_4
+    pic_p.paragraph_format.space_after = _PT_4
     run = pic_p.add_run()
     run.add_picture(buf, width=Inches(4.5))
     pic_el = pic_p._element
-    body.remove(pic_el)
     title_el.addnext(pic_el)
 
     # Notes (with 0.5" left and right indent)
-    note_p = doc.add_paragraph()
-    note_p.paragraph_format.space_before = Pt(4)
-    note_p.paragraph_format.space_after = Pt(6)
-    note_p.paragraph_format.first_line_indent = Inches(0)
-    note_p.paragraph_format.left_indent = Inches(0.5)
-    note_p.paragraph_format.right_indent = Inches(0.5)
-    rn1 = note_p.add_run('Notes: ')
-    rn1.bold = True
-    rn1.font.size = Pt(7.5)
-    rn2 = note_p.add_run(
+    note_p = new_paragraph(doc)
+    note_p.paragraph_format.space_before = _PT_4
+    note_p.paragraph_format.space_after = _PT_6
+    note_p.paragraph_format.first_line_indent = _IN_0
+    note_p.paragraph_format.left_indent = _IN_HALF
+    note_p.paragraph_format.right_indent = _IN_HALF
+    add_run_styled(note_p, 'Notes: ', bold=True, size=_PT_7_5)
+    add_run_styled(
+        note_p,
         'Each point is one country. The dashed line marks unchanged rank. '
         'Countries above the line improve their position after reliability '
         'adjustment; countries below it fall. Stars (\u2605) indicate countries '
@@ -4084,11 +4166,10 @@ def write_figure4b(doc, body, last_ref, demand_data):
         'Values in parentheses show the reliability index \u03BE. '
         'Even countries with \u03BE \u2248 1 shift off the diagonal because '
         'penalizing low-\u03BE competitors pushes them down, mechanically '
-        'raising higher-\u03BE countries.'
+        'raising higher-\u03BE countries.',
+        size=_PT_7_5,
     )
-    rn2.font.size = Pt(7.5)
     note_el = note_p._element
-    body.remove(note_el)
     pic_el.addnext(note_el)
 
     return note_el
@@ -4102,25 +4183,25 @@ def write_table1(doc, body, after_el, demand_data):
     pb_el = add_page_break(doc, body, after_el)
 
     # Table 1 title with bookmark
-    tp1 = doc.add_paragraph()
-    tp1.paragraph_format.space_before = Pt(6)
-    tp1.paragraph_format.space_after = Pt(3)
-    tp1.paragraph_format.first_line_indent = Inches(0)
+    tp1 = new_paragraph(doc)
+    tp1.paragraph_format.space_before = _PT_6
+    tp1.paragraph_format.space_after = _PT_3
+    tp1.paragraph_format.first_line_indent = _IN_0
     tp1._element.append(make_bookmark(110, 'Table1'))
     hl_a1 = OxmlElement('w:hyperlink')
-    hl_a1.set(qn('w:anchor'), 'Table1txt')
-    hl_a1.set(qn('w:history'), '1')
+    hl_a1.set(_Q_W_ANCHOR, 'Table1txt')
+    hl_a1.set(_Q_W_HISTORY, '1')
     r_a1 = OxmlElement('w:r')
     rPr_a1 = OxmlElement('w:rPr')
     b_a1 = OxmlElement('w:b')
     rPr_a1.append(b_a1)
     sz_a1 = OxmlElement('w:sz')
-    sz_a1.set(qn('w:val'), '20')
+    sz_a1.set(_Q_W_VAL, '20')
     rPr_a1.append(sz_a1)
     clr_a1 = OxmlElement('w:color')
-    clr_a1.set(qn('w:val'), LINK_COLOR)
+    clr_a1.set(_Q_W_VAL, LINK_COLOR)
     uu_a1 = OxmlElement('w:u')
-    uu_a1.set(qn('w:val'), 'single')
+    uu_a1.set(_Q_W_VAL, 'single')
     rPr_a1.append(clr_a1)
     rPr_a1.append(uu_a1)
     r_a1.append(rPr_a1)
@@ -4130,11 +4211,8 @@ def write_table1(doc, body, after_el, demand_data):
     hl_a1.append(r_a1)
     tp1._element.append(hl_a1)
     tp1._element.append(make_bookmark_end(110))
-    run_tt1 = tp1.add_run('. Model parameters')
-    run_tt1.bold = True
-    run_tt1.font.size = Pt(10)
+    add_run_styled(tp1, '. Model parameters', bold=True, size=_PT_10)
     tp1_el = tp1._element
-    body.remove(tp1_el)
     pb_el.addnext(tp1_el)
 
     # Load parameters from CSV
@@ -4164,26 +4242,17 @@ def write_table1(doc, body, after_el, demand_data):
     }
 
     n_params = len(param_rows)
-    param_tbl = doc.add_table(rows=n_params + 1, cols=5)
-    param_tbl.style = 'Table Grid'
+    param_tbl = new_table(doc, n_params + 1, 5, style='Table Grid')
     param_tbl.alignment = WD_TABLE_ALIGNMENT.CENTER
-    tblPr = param_tbl._tbl.find(qn('w:tblPr'))
+    tblPr = param_tbl._tbl.find(_Q_W_TBLPR)
     if tblPr is None:
         tblPr = OxmlElement('w:tblPr')
         param_tbl._tbl.insert(0, tblPr)
-    old_bdr = tblPr.find(qn('w:tblBorders'))
+    old_bdr = tblPr.find(_Q_W_TBLBORDERS)
     if old_bdr is not None:
         tblPr.remove(old_bdr)
-    tblBorders = OxmlElement('w:tblBorders')
-    for side in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
-        b = OxmlElement(f'w:{side}')
-        b.set(qn('w:val'), 'none')
-        b.set(qn('w:sz'), '0')
-        b.set(qn('w:space'), '0')
-        b.set(qn('w:color'), 'auto')
-        tblBorders.append(b)
-    tblPr.append(tblBorders)
-    tblW = tblPr.find(qn('w:tblW'))
+    tblPr.append(copy.deepcopy(_NO_BORDERS))
+    tblW = tblPr.find(_Q_W_TBLW)
     if tblW is None:
         tblW = OxmlElement('w:tblW')
         tblPr.append(tblW)
@@ -4193,28 +4262,17 @@ def write_table1(doc, body, after_el, demand_data):
     _pcw = [Inches(2.3), Inches(0.6), Inches(0.6), Inches(1.0), Inches(2.0)]
     _pcw_labels = ['Parameter', 'Symbol', 'Eq.', 'Value', 'Source']
 
-    def _cell_border(tc, sides, style='single'):
-        tcPr = tc.get_or_add_tcPr()
-        tcB = OxmlElement('w:tcBorders')
-        for s in sides:
-            b = OxmlElement(f'w:{s}')
-            b.set(qn('w:val'), style)
-            b.set(qn('w:sz'), '4')
-            b.set(qn('w:space'), '0')
-            b.set(qn('w:color'), 'auto')
-            tcB.append(b)
-        tcPr.append(tcB)
-
-    for j, lbl in enumerate(_pcw_labels):
-        cell = param_tbl.rows[0].cells[j]
+    # Resolve each row's cells once (every rows[i].cells access re-derives the grid)
+    # and set width and borders on one tcPr per cell
+    tbl_rows = param_tbl.rows
+    for cell, lbl, w in zip(tbl_rows[0].cells, _pcw_labels, _pcw, strict=True):
         cell.text = ''
         p_h = cell.paragraphs[0]
         p_h.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        rh = p_h.add_run(lbl)
-        rh.bold = True
-        rh.font.size = Pt(8.5)
-        cell.width = _pcw[j]
-        _cell_border(cell._tc, ['top', 'bottom'])
+        add_run_styled(p_h, lbl, bold=True, size=Pt(8.5))
+        tcPr = cell._tc.get_or_add_tcPr()
+        tcPr.width = w
+        tcPr.append(copy.deepcopy(_HEAD_BORDERS))
 
     for i, pr in enumerate(param_rows):
         sym_display = _sym_map.get(pr['symbol'], pr['symbol'])
@@ -4233,70 +4291,62 @@ def write_table1(doc, body, after_el, demand_data):
         src_text = pr['source']
         src_bm = _source_to_bm.get(src_text)
         row_data = [pr['description'], sym_display, eq_str, val_str]
+        row_cells = tbl_rows[i + 1].cells
+        tcPrs = [cell._tc.get_or_add_tcPr() for cell in row_cells]
         for j, txt in enumerate(row_data):
-            cell = param_tbl.rows[i + 1].cells[j]
+            cell = row_cells[j]
             cell.text = ''
             p_c = cell.paragraphs[0]
             if j == 0:
                 p_c.alignment = WD_ALIGN_PARAGRAPH.LEFT
             else:
                 p_c.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            rc = p_c.add_run(txt)
-            rc.font.size = Pt(8)
-            cell.width = _pcw[j]
-        src_cell = param_tbl.rows[i + 1].cells[4]
+            add_run_styled(p_c, txt, size=_PT_8)
+            tcPrs[j].width = _pcw[j]
+        src_cell = row_cells[4]
         src_cell.text = ''
         src_p = src_cell.paragraphs[0]
         src_p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        src_cell.width = _pcw[4]
+        tcPrs[4].width = _pcw[4]
         if src_bm and src_text:
             rPr_src = OxmlElement('w:rPr')
             sz_src = OxmlElement('w:sz')
-            sz_src.set(qn('w:val'), '16')
+            sz_src.set(_Q_W_VAL, '16')
             rPr_src.append(sz_src)
             hl_src = make_hyperlink(src_bm, src_text, rPr_orig=rPr_src)
             src_p._element.append(hl_src)
         elif src_text:
-            rc_src = src_p.add_run(src_text)
-            rc_src.font.size = Pt(8)
+            add_run_styled(src_p, src_text, size=_PT_8)
         if i == n_params - 1:
-            for j in range(5):
-                _cell_border(param_tbl.rows[i + 1].cells[j]._tc, ['bottom'], style='double')
-
-    for row in param_tbl.rows:
-        for cell in row.cells:
-            for pp in cell.paragraphs:
-                pPr = pp._element.get_or_add_pPr()
-                sp = OxmlElement('w:spacing')
-                sp.set(qn('w:before'), '10')
-                sp.set(qn('w:after'), '10')
-                pPr.append(sp)
+            for tcPr in tcPrs:
+                tcPr.append(copy.deepcopy(_LAST_BORDERS))
+
+    # Walk the w:p elements directly; rows/cells/paragraphs would build a wrapper per cell
+    for p_el in param_tbl._tbl.iter(_Q_W_P):
+        p_el.get_or_add_pPr().append(copy.deepcopy(_CELL_SPACING))
 
     param_tbl_el = param_tbl._tbl
-    body.remove(param_tbl_el)
     tp1_el.addnext(param_tbl_el)
 
     # Table 1 notes
-    note = doc.add_paragraph()
-    note.paragraph_format.space_before = Pt(4)
-    note.paragraph_format.space_after = Pt(6)
-    note.paragraph_format.first_line_indent = Inches(0)
+    note = new_paragraph(doc)
+    note.paragraph_format.space_before = _PT_4
+    note.paragraph_format.space_after = _PT_6
+    note.paragraph_format.first_line_indent = _IN_0
     note.paragraph_format.line_spacing = 1.0
-    rn1 = note.add_run('Notes: ')
-    rn1.bold = True
-    rn1.font.size = Pt(7.5)
-    rn1 = note.add_run(
+    add_run_styled(note, 'Notes: ', bold=True, size=_PT_7_5)
+    add_run_styled(
+        note,
         'Hardware cost \u03C1 = P\u1d33\u1d18\u1d1c / (L \u00b7 H \u00b7 \u03B2). '
         'PUE(\u03B8) = \u03C6 + \u03B4 \u00b7 max(0, \u03B8 \u2212 \u03B8\u0304). '
         'RTT = round-trip time, the network delay for a data packet to travel from '
         'client to server and back, measured in milliseconds. '
         'The reliability index \u03BE\u2C7C combines governance quality, grid reliability, '
         'and sanctions exposure (equation 2). '
-        'The baseline calibration sets \u03BE\u2C7C = 1 for all countries.'
+        'The baseline calibration sets \u03BE\u2C7C = 1 for all countries.',
+        size=_PT_7_5,
     )
-    rn1.font.size = Pt(7.5)
     note_el = note._element
-    body.remove(note_el)
     param_tbl_el.addnext(note_el)
 
     return note_el
@@ -4308,18 +4358,15 @@ def write_references(doc, body, refs):
     # Page break before References heading
     add_page_break(doc, body, refs.getprevious())
 
-    all_now = list(body)
-    ri = all_now.index(refs)
     ref_els = []
     ref_txts = []
-    for i in range(ri + 1, len(all_now)):
-        el = all_now[i]
-        if el.tag == qn('w:p'):
-            t = "".join(r.text or "" for r in el.findall(f'.//{qn("w:t")}'))
+    for el in refs.itersiblings():
+        if el.tag == _Q_W_P:
+            t = "".join(r.text or "" for r in el.findall(_Q_W_T_ALL))
             if t.strip():
                 ref_txts.append(t.strip())
                 ref_els.append(el)
-        elif el.tag == qn('w:sectPr'):
+        elif el.tag == _Q_W_SECTPR:
             break
 
     new_refs = [
@@ -4461,12 +4508,12 @@ def write_references(doc, body, refs):
     bm_id_refs = [500]  # bookmark IDs for references
     cur = refs
     for rt in ref_txts:
-        p = doc.add_paragraph()
+        p = new_paragraph(doc)
         p.paragraph_format.first_line_indent = Inches(-0.5)
-        p.paragraph_format.left_indent = Inches(0.5)
-        p.paragraph_format.space_before = Pt(0)
-        p.paragraph_format.space_after = Pt(4)
-        p.paragraph_format.line_spacing = Pt(12)
+        p.paragraph_format.left_indent = _IN_HALF
+        p.paragraph_format.space_before = _PT_0
+        p.paragraph_format.space_after = _PT_4
+        p.paragraph_format.line_spacing = _PT_12
         italic_portion = find_italic_portion(rt)
         key = find_ref_key(rt)
         if key:
@@ -4488,7 +4535,6 @@ def write_references(doc, body, refs):
         else:
             _write_ref_segments(p, rt, italic_portion)
         el = p._element
-        body.remove(el)
         cur.addnext(el)
         cur = el
     print(f"  {len(ref_txts)} references")
@@ -4500,7 +4546,7 @@ def link_citations(body):
     bm_id_cite = [200]
     passes = 0
     while True:
-        n = link_citations_pass(body, CITE_MAP, bm_id_cite)
+        n = link_citations_pass(body, CITE_MAP_SORTED, CITE_RE, bm_id_cite)
         passes += 1
         if n == 0 or passes > 10:
             break
@@ -4510,15 +4556,14 @@ def link_citations(body):
 def link_equations(body):
     """Link 'equation (N)' mentions in text to their display equation bookmarks."""
     print("Linking equation references...")
-    import re
     count = 0
     bm_id_eq = [900]
     eq_pattern = re.compile(r'equation \((\d+)\)')
-    for p_el in list(body.findall(qn('w:p'))):
+    for p_el in list(body.findall(_Q_W_P)):
         for child in list(p_el):
-            if child.tag != qn('w:r'):
+            if child.tag != _Q_W_R:
                 continue
-            t_el = child.find(qn('w:t'))
+            t_el = child.find(_Q_W_T)
             if t_el is None or not t_el.text:
                 continue
             text = t_el.text
@@ -4531,7 +4576,7 @@ def link_equations(body):
             idx = m.start()
             before = text[:idx]
             after = text[idx + len(match_text):]
-            rPr_orig = child.find(qn('w:rPr'))
+            rPr_orig = child.find(_Q_W_RPR)
             t_el.text = before
             t_el.set(XML_SPACE, SPACE_PRESERVE)
             ins = child
@@ -4563,38 +4608,32 @@ def fix_orphan_backlinks(body, refs):
     # Collect all bookmark names in the document
     all_bookmarks = set()
     for el in body:
-        for bm in el.findall(f'.//{{{W_NS}}}bookmarkStart'):
-            name = bm.get(f'{{{W_NS}}}name', '')
+        for bm in el.findall(f'.//{_Q_W_BOOKMARKSTART}'):
+            name = bm.get(_Q_W_NAME, '')
             if name:
                 all_bookmarks.add(name)
 
     # Scan reference paragraphs for hyperlinks with missing targets
-    refs_idx = list(body).index(refs)
     fixed = 0
-    for el in list(body)[refs_idx + 1:]:
-        if el.tag == f'{{{W_NS}}}sectPr':
+    for el in refs.itersiblings():
+        if el.tag == _Q_W_SECTPR:
             break
         # Stop at headings (e.g. Appendix) that follow references
-        if el.tag == qn('w:p'):
-            pPr = el.find(qn('w:pPr'))
+        if el.tag == _Q_W_P:
+            pPr = el.find(_Q_W_PPR)
             if pPr is not None:
-                pS = pPr.find(qn('w:pStyle'))
-                if pS is not None and 'Heading' in pS.get(qn('w:val'), ''):
+                pS = pPr.find(_Q_W_PSTYLE)
+                if pS is not None and 'Heading' in pS.get(_Q_W_VAL, ''):
                     break
-                if pPr.find(f'{{{W_NS}}}sectPr') is not None:
+                if pPr.find(_Q_W_SECTPR) is not None:
                     break
-        for hl in el.findall(f'.//{{{W_NS}}}hyperlink'):
-            anchor = hl.get(f'{{{W_NS}}}anchor', '')
+        for hl in el.findall(f'.//{_Q_W_HYPERLINK}'):
+            anchor = hl.get(_Q_W_ANCHOR, '')
             if anchor and anchor not in all_bookmarks:
                 # Replace hyperlink element with its child runs (keep text, drop link)
-                parent = hl.getparent()
-                idx = list(parent).index(hl)
-                children = list(hl)
-                for child in children:
-                    hl.remove(child)
-                    parent.insert(idx, child)
-                    idx += 1
-                parent.remove(hl)
+                for child in list(hl):
+                    hl.addprevious(child)
+                hl.getparent().remove(hl)
                 fixed += 1
     if fixed:
         print(f"  Fixed {fixed} orphan back-link(s) in references")
@@ -4605,30 +4644,41 @@ def apply_formatting(doc, body, refs, title_el, author_el, ver_el, abs_text_el):
     # Set Normal style defaults
     normal = doc.styles['Normal']
     normal.font.name = TIMES_NEW_ROMAN
-    normal.font.size = Pt(12)
+    normal.font.size = _PT_12
     normal.paragraph_format.line_spacing = 1.5
 
     # Identify reference paragraphs to protect their spacing
-    refs_idx = list(body).index(refs)
     ref_elements = set()
-    for el in list(body)[refs_idx + 1:]:
-        if el.tag == qn('w:sectPr'):
+    for el in refs.itersiblings():
+        if el.tag == _Q_W_SECTPR:
             break
-        if el.tag == qn('w:p'):
-            pPr = el.find(qn('w:pPr'))
+        if el.tag == _Q_W_P:
+            pPr = el.find(_Q_W_PPR)
             if pPr is not None:
-                pS = pPr.find(qn('w:pStyle'))
-                if pS is not None and 'Heading' in pS.get(qn('w:val'), ''):
+                pS = pPr.find(_Q_W_PSTYLE)
+                if pS is not None and 'Heading' in pS.get(_Q_W_VAL, ''):
                     break
-                if pPr.find(f'{{{W_NS}}}sectPr') is not None:
+                if pPr.find(_Q_W_SECTPR) is not None:
                     break
             ref_elements.add(el)
 
     # Paragraphs to protect from global formatting (centered title page elements)
     _protected = {title_el, author_el, ver_el, abs_text_el}
+    # Both sets keep their own paragraph spacing; check them with one lookup
+    _keep_spacing = ref_elements | _protected
+
+    # Resolve paragraph style names once; p.style looks each id up in styles.xml
+    # (and scans every style for the default when the paragraph has no pStyle)
+    style_names = {}
+    for st in doc.styles:
+        if st.type == WD_STYLE_TYPE.PARAGRAPH:
+            style_names.setdefault(st.style_id, st.name)
+    default_style = doc.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+    default_name = default_style.name if default_style is not None else ''
 
     for p in doc.paragraphs:
-        style = p.style.name if p.style else ''
+        p_el = p._element
+        style = style_names.get(p_el.style, default_name)
         # Heading 1: Times New Roman, blue, 14pt, bold
         if style == 'Heading 1':
             for run in p.runs:
@@ -4642,41 +4692,44 @@ def apply_formatting(doc, body, refs, title_el, author_el, ver_el, abs_text_el):
             for run in p.runs:
                 run.font.color.rgb = HEADING_BLUE
                 run.font.name = TIMES_NEW_ROMAN
-                run.font.size = Pt(12)
+                run.font.size = _PT_12
                 run.italic = True
                 run.bold = False
             continue
         if 'Heading' not in style and p.text.strip():
             # Skip title page elements (centered)
-            if p._element not in _protected:
+            if p_el not in _protected:
                 p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
                 if p.paragraph_format.first_line_indent is None or p.paragraph_format.first_line_indent > 0:
-                    p.paragraph_format.first_line_indent = Inches(0)
+                    p.paragraph_format.first_line_indent = _IN_0
             # Subtitle runs: italic (non-bold) first run ending with "." → font 12, TNR, not bold
             runs = [r for r in p.runs if r.text.strip()]
             if runs and runs[0].italic and not runs[0].bold and runs[0].text.rstrip().endswith('.'):
-                runs[0].font.size = Pt(12)
+                runs[0].font.size = _PT_12
                 runs[0].font.name = TIMES_NEW_ROMAN
                 runs[0].bold = False
             # Preserve reference formatting (hanging indent + 4pt spacing)
-            if p._element in ref_elements:
+            # and title page spacing
+            if p_el in _keep_spacing:
                 continue
-            # Preserve title page spacing
-            if p._element in _protected:
-                continue
-            p.paragraph_format.space_before = Pt(0)
+            p.paragraph_format.space_before = _PT_0
             # Preserve Pt(2) spacing on paragraphs immediately before equations
-            if p.paragraph_format.space_after is None or p.paragraph_format.space_after >= Pt(8):
-                p.paragraph_format.space_after = Pt(8)
+            if p.paragraph_format.space_after is None or p.paragraph_format.space_after >= _PT_8:
+                p.paragraph_format.space_after = _PT_8
+
+
+# Footer PAGE field (static; parsed per use so each footer gets its own copy)
+_PAGE_FIELD_XML = (f'<w:fldSimple {nsdecls("w")} w:instr=" PAGE ">'
+                   '<w:r><w:t>1</w:t></w:r></w:fldSimple>')
 
 
 def add_page_numbers_and_break(doc, body, kw_el):
     print("Adding page numbers...")
     section = doc.sections[0]
-    section.left_margin = Inches(1)
-    section.right_margin = Inches(1)
-    section.top_margin = Inches(1)
-    section.bottom_margin = Inches(1)
+    section.left_margin = _IN_1
+    section.right_margin = _IN_1
+    section.top_margin = _IN_1
+    section.bottom_margin = _IN_1
     section.different_first_page_header_footer = True
 
     # Default footer: right-aligned page number
@@ -4686,14 +4739,7 @@ def add_page_numbers_and_break(doc, body, kw_el):
     fp.alignment = WD_ALIGN_PARAGRAPH.RIGHT
     fp.clear()
     # Insert PAGE field: w:fldSimple or fldChar sequence
-    fld = OxmlElement('w:fldSimple')
-    fld.set(qn('w:instr'), ' PAGE ')
-    r = OxmlElement('w:r')
-    t = OxmlElement('w:t')
-    t.text = '1'
-    r.append(t)
-    fld.append(r)
-    fp._element.append(fld)
+    fp._element.append(parse_xml(_PAGE_FIELD_XML))
 
     # First page footer: empty (no page number on title page)
     first_footer = section.first_page_footer
@@ -4708,19 +4754,27 @@ def add_page_numbers_and_break(doc, body, kw_el):
     add_page_break(doc, body, kw_el)
 
 
+# v8 template headings: "N. Title" / "N.M Title" numbers to anchor on, with a
+# word the title must contain (empty = any title), plus unnumbered headings
+_HEADING_NUM_RE = re.compile(r'(\d+(?:\.\d+)?)\.?\s+(.*)')
+_HEADING_KEYS = {'1': 'Model', '1.1': '', '1.2': '', '2': 'Comp', '3': 'Make',
+                 '4': 'Calib', '5': 'Conc'}
+_HEADING_NAMED = {'References': 'refs', 'Abstract': 'abs'}
+
+
 def main():
+    # One timestamp for the whole run (version stamp on the title page)
+    build_time = datetime.now()
+
     # ═══════════════════════════════════════════════════════════════════════
     # LOAD DATA (v3)
     # ═══════════════════════════════════════════════════════════════════════
 
     print("Loading data...")
-    cal = []
-    with open(DATA / "calibration_results_v3.csv", encoding="utf-8") as f:
-        cal = list(csv.DictReader(f))
-    reg = {}
-    with open(DATA / "calibration_regimes_v3.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            reg[row["iso3"]] = row
+    inputs = load_inputs()
+    cal = inputs["cal"]
+    cost_arrs = cost_inputs(cal)  # cost primitives parsed once for recompute_costs
+    reg = {row["iso3"]: row for row in inputs["reg"]}
     # World Bank operational ECA region (developing Europe & Central Asia)
     eca = {
         'ALB', 'ARM', 'AZE', 'BLR', 'BIH', 'BGR', 'HRV', 'CZE', 'EST',
@@ -4729,30 +4783,31 @@ def main():
         'TKM', 'UKR', 'UZB',
     }
 
-    eca_cal = [row for row in cal if row["iso3"] in eca]
-    non_eca_cal = [row for row in cal if row["iso3"] not in eca]
+    eca_cal, non_eca_cal = [], []
+    for row in cal:
+        (eca_cal if row["iso3"] in eca else non_eca_cal).append(row)
+    iso2row = {row["iso3"]: row for row in cal}
+    iso_country = {iso: row["country"] for iso, row in iso2row.items()}
     n_eca = len(eca_cal)
     n_total = len(cal)
 
     # Reliability index ξ_j ∈ (0, 1]
-    xi = {}
-    with open(DATA / "reliability_index.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            xi[row["iso3"]] = float(row["xi_reliability"])
+    xi = inputs["xi"]
 
     _reg_init = {"full import": 0, "import training + build inference": 0,
                  "full domestic": 0, "build training + import inference": 0}
     all_reg = dict(_reg_init)
     all_sov = dict(_reg_init)
     for row in cal:
-        iso = row["iso3"]
-        if iso in reg:
-            rr = reg[iso]["regime"]
-            rs = reg[iso]["regime_with_sovereignty"]
-            if rr in all_reg:
-                all_reg[rr] += 1
-            if rs in all_sov:
-                all_sov[rs] += 1
+        r = reg.get(row["iso3"])
+        if r is None:
+            continue
+        rr = r["regime"]
+        rs = r["regime_with_sovereignty"]
+        if rr in all_reg:
+            all_reg[rr] += 1
+        if rs in all_sov:
+            all_sov[rs] += 1
 
     print(f"  Total: {n_total}, ECA: {n_eca}")
     print(f"  All regimes: {dict((k, v) for k, v in all_reg.items() if v)}")
@@ -4760,104 +4815,90 @@ def main():
     # ═══════════════════════════════════════════════════════════════════════
     # DEMAND CALIBRATION (MW-capacity-based shares)
     # ═══════════════════════════════════════════════════════════════════════
-    print("Loading data center capacity estimates...")
-    dc_counts = {}
-    dc_capacity = {}
-    dc_sources = {}
-    with open(DATA / "dc_capacity_estimates.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            dc_counts[row["iso3"]] = int(row["n_datacenters"])
-            dc_capacity[row["iso3"]] = float(row["capacity_mw"])
-            dc_sources[row["iso3"]] = row["source"]
+    dc_counts, dc_capacity, dc_sources = inputs["dc"]
 
     # Capacity for each calibration country
-    dc_k = {}
-    for row in cal:
-        iso = row["iso3"]
-        if iso in dc_capacity:
-            dc_k[iso] = dc_capacity[iso]
-        else:
-            dc_k[iso] = 5.0  # minimum 5 MW for countries with no data
+    # (minimum 5 MW for countries with no data)
+    dc_k = {row["iso3"]: dc_capacity.get(row["iso3"], 5.0) for row in cal}
     total_dc = sum(dc_k.values())
     omega = {iso: d / total_dc for iso, d in dc_k.items()}
 
     # Top demand centers
-    sorted_omega = sorted(omega.items(), key=lambda x: -x[1])
     top5_labels = []
-    for iso, w in sorted_omega[:5]:
-        co = next(r["country"] for r in cal if r["iso3"] == iso)
+    for iso, w in heapq.nlargest(5, omega.items(), key=itemgetter(1)):
+        co = iso_country[iso]
         top5_labels.append((iso, co, w))
     top5_share = sum(w for _, _, w in top5_labels)
 
-    # Training export revenue shares
-    train_revenue = {}
-    for iso in dc_k:
-        if iso in reg:
-            src = reg[iso]["best_train_source"]
-            train_revenue[src] = train_revenue.get(src, 0) + omega[iso]
+    # Lambda* for each country
+    costs_dict = {row["iso3"]: float(row["c_j_total"]) + ETA for row in cal}
+    # Cheapest foreign producer is the global minimum, except for the
+    # cheapest country itself, whose cheapest foreign producer is the runner-up
+    g_min_iso = min(costs_dict, key=costs_dict.__getitem__)
+    g_min = costs_dict[g_min_iso]
+    g_2nd = min(c for i, c in costs_dict.items() if i != g_min_iso)
+    lambda_star = {iso: c_k / (g_2nd if iso == g_min_iso else g_min) - 1
+                   for iso, c_k in costs_dict.items()}
 
-    # Inference export revenue shares
-    inf_revenue = {}
-    for iso in dc_k:
-        if iso in reg:
-            src = reg[iso]["best_inf_source"]
-            inf_revenue[src] = inf_revenue.get(src, 0) + omega[iso]
+    sanctioned = {'IRN'}
+
+    # Single pass over demand centers: export revenue shares, welfare cost of
+    # sovereignty, counterfactual (doubling sovereignty to 20%), KGZ clients
+    thr_10 = 1.10 * g_min
+    thr_20 = 1.20 * g_min
+    train_revenue = defaultdict(float)
+    inf_revenue = defaultdict(float)
+    welfare_train = 0
+    welfare_inf = 0
+    weighted_avg_cost = 0
+    count_dom_10 = 0
+    count_dom_20 = 0
+    export_share_10 = 0
+    export_share_20 = 0
+    kgz_inf_clients = []
+    for iso, w in omega.items():
+        r = reg.get(iso)
+        c_k = costs_dict.get(iso)
+        if r is not None:
+            src = r["best_train_source"]
+            train_revenue[src] += w
+            src = r["best_inf_source"]
+            inf_revenue[src] += w
+            if src == "KGZ":
+                co = iso_country.get(iso, iso)
+                kgz_inf_clients.append((iso, co, w * 100))
+            if c_k is not None:
+                best_train = float(r["best_train_cost"])
+                best_inf = float(r["best_inf_cost"])
+                c_k_inf = float(r["P_I_domestic"])
+                welfare_train += w * max(0, c_k - best_train)
+                welfare_inf += w * max(0, c_k_inf - best_inf)
+        if c_k is None:
+            continue
+        weighted_avg_cost += w * c_k
+        if c_k <= thr_10:
+            count_dom_10 += 1
+        else:
+            export_share_10 += w
+        if c_k <= thr_20:
+            count_dom_20 += 1
+        else:
+            export_share_20 += w
+
+    train_revenue = dict(train_revenue)
+    inf_revenue = dict(inf_revenue)
 
     # HHI
     hhi_t = sum(s**2 for s in train_revenue.values())
     hhi_i = sum(s**2 for s in inf_revenue.values())
 
-    # Lambda* for each country
-    costs_dict = {row["iso3"]: float(row["c_j_total"]) + ETA for row in cal}
-    lambda_star = {}
-    for iso, c_k in costs_dict.items():
-        min_foreign = min(c for i, c in costs_dict.items() if i != iso)
-        lambda_star[iso] = c_k / min_foreign - 1
-
-    # Welfare cost of sovereignty
-    welfare_train = 0
-    welfare_inf = 0
-    for iso in dc_k:
-        if iso in reg and iso in costs_dict:
-            c_k = costs_dict[iso]
-            best_train = float(reg[iso]["best_train_cost"])
-            best_inf = float(reg[iso]["best_inf_cost"])
-            c_k_inf = float(reg[iso]["P_I_domestic"])
-            welfare_train += omega[iso] * max(0, c_k - best_train)
-            welfare_inf += omega[iso] * max(0, c_k_inf - best_inf)
     welfare_total = welfare_train + welfare_inf
-    weighted_avg_cost = sum(omega[iso] * costs_dict[iso]
-                            for iso in dc_k if iso in costs_dict)
     welfare_pct = welfare_total / weighted_avg_cost * 100
-
-    # Counterfactual: doubling sovereignty to 20%
-    min_cost = min(costs_dict.values())
-    count_dom_10 = sum(
-        1 for iso in dc_k
-        if iso in costs_dict and costs_dict[iso] <= 1.10 * min_cost)
-    count_dom_20 = sum(
-        1 for iso in dc_k
-        if iso in costs_dict and costs_dict[iso] <= 1.20 * min_cost)
     extra_dom = count_dom_20 - count_dom_10
-    export_share_10 = sum(
-        omega[iso] for iso in dc_k
-        if iso in costs_dict and costs_dict[iso] > 1.10 * min_cost)
-    export_share_20 = sum(
-        omega[iso] for iso in dc_k
-        if iso in costs_dict and costs_dict[iso] > 1.20 * min_cost)
-
-    sanctioned = {'IRN'}
-
-    # Kyrgyzstan inference clients
-    kgz_inf_clients = []
-    for iso in dc_k:
-        if iso in reg and reg[iso]["best_inf_source"] == "KGZ":
-            co = next((r["country"] for r in cal if r["iso3"] == iso), iso)
-            kgz_inf_clients.append((iso, co, omega[iso] * 100))
 
     # Build demand_data dict for passing to write functions
     demand_data = {
-        "omega": omega, "sorted_omega": sorted_omega,
+        "omega": omega,
         "top5_labels": top5_labels, "top5_share": top5_share,
         "train_revenue": train_revenue, "inf_revenue": inf_revenue,
         "hhi_t": hhi_t, "hhi_i": hhi_i,
@@ -4879,10 +4920,7 @@ def main():
     print("Computing capacity-constrained equilibrium...")
 
     # Load grid capacity data (apply scale correction)
-    k_bar = {}
-    with open(DATA / "grid_capacity_estimates.csv", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            k_bar[row["iso3"]] = float(row["K_bar_gpu_hours"]) * K_BAR_SCALE
+    k_bar = {iso: k * K_BAR_SCALE for iso, k in inputs["k_bar"].items()}
 
     # Training supply stack: rank countries by c_j, compute cumulative capacity
     supply_stack = sorted(
@@ -4892,49 +4930,21 @@ def main():
     )
 
     def solve_capacity_equilibrium(lam, label):
-        """Solve for capacity-constrained training equilibrium at given lambda."""
-        p_T = supply_stack[0][1]  # start with cheapest
-        m_T = 0
-        Q_TX = 0
-        for _ in range(30):
-            Q_TX = 0
-            for iso in dc_k:
-                if iso in costs_dict:
-                    c_k = costs_dict[iso]
-                    if c_k > (1 + lam) * p_T:
-                        Q_TX += ALPHA * omega.get(iso, 0) * Q_TOTAL
-            cum_cap = 0
-            found = False
-            for idx, (iso_j, c_j, k_j) in enumerate(supply_stack):
-                if iso_j in sanctioned:
-                    continue
-                cap_available = k_j * ALPHA
-                cum_cap += cap_available
-                if cum_cap >= Q_TX and Q_TX > 0:
-                    p_T_new = c_j
-                    m_T = idx
-                    found = True
-                    break
-            if found and abs(p_T_new - p_T) < 0.0001:
-                p_T = p_T_new
-                break
-            if found:
-                p_T = p_T_new
-
-        # Compute shares
-        shares = {}
-        remaining = Q_TX
-        for iso_j, c_j, k_j in supply_stack:
-            if iso_j in sanctioned:
-                continue
-            if c_j > p_T:
-                break
-            ca = min(k_j * ALPHA, remaining)
-            if ca > 0:
-                shares[iso_j] = ca
-                remaining -= ca
-            if remaining <= 0:
-                break
+        """Solve for capacity-constrained training equilibrium at given lambda.
+
+        Reads supply_stack and costs_dict from the enclosing scope, so the
+        cost-recovery pass below can rebind them and call this again.
+        """
+        stack_isos = [iso for iso, _, _ in supply_stack]
+        elig_isos = [iso for iso in stack_isos if iso not in sanctioned]
+        dc_priced = [iso for iso in dc_k if iso in costs_dict]
+        p_T, alloc = _solve_training(
+            [c for _, c, _ in supply_stack], [k for _, _, k in supply_stack],
+            [iso in sanctioned for iso in stack_isos],
+            np.array([costs_dict[iso] for iso in dc_priced]),
+            np.array([ALPHA * omega.get(iso, 0) * Q_TOTAL for iso in dc_priced]), lam)
+        # alloc covers only the stack prefix priced at or below p_T
+        shares = {iso: a for iso, a in zip(elig_isos, alloc.tolist(), strict=False) if a > 0}
         total_exp = sum(shares.values())
         hhi = sum((s / total_exp) ** 2 for s in shares.values()) if total_exp > 0 else 1.0
         # Shadow values
@@ -4952,16 +4962,16 @@ def main():
         print(f"  [{label}] p_T = ${p_T:.3f}/hr, {len(shares)} exporters, "
               f"HHI_T = {hhi:.4f}, {len(mu)} constrained")
         for iso_m, mu_v in sorted(mu.items(), key=lambda x: -x[1])[:5]:
-            co = next((r["country"] for r in cal if r["iso3"] == iso_m), iso_m)
+            co = iso_country.get(iso_m, iso_m)
             print(f"    {co}: \u03bc = ${mu_v:.3f}/hr")
-        return p_T, m_T, shares, hhi, mu, ls_cap, len(shares)
+        return p_T, shares, hhi, mu, ls_cap, len(shares)
 
     # Pass 1: pure cost minimization (lambda=0) — main capacity result
-    (p_T_0, _, _, cap_hhi_0, mu_0, ls_0, n_exp_0
+    (p_T_0, _, cap_hhi_0, mu_0, ls_0, n_exp_0
      ) = solve_capacity_equilibrium(0.0, "\u03bb=0")
 
     # Pass 2: with sovereignty (lambda=LAMBDA)
-    (p_T_sov, _, _, cap_hhi_sov, _, _, n_exp_sov
+    (p_T_sov, _, cap_hhi_sov, _, _, n_exp_sov
      ) = solve_capacity_equilibrium(LAMBDA, f"\u03bb={LAMBDA}")
 
     # Store both sets of results
@@ -4979,10 +4989,7 @@ def main():
     print("Computing cost-recovery adjustment...")
 
     # Load latency data for inference recomputation
-    latency_data = {}
-    with open(DATA / "country_pair_latency.csv", encoding="utf-8") as f:
-        for lrow in csv.DictReader(f):
-            latency_data[(lrow["iso3_from"], lrow["iso3_to"])] = float(lrow["avg_ms"])
+    latency_data = inputs["latency"]
     DOMESTIC_LATENCY_DEFAULT = 5.0
 
     def _get_latency(j, k):
@@ -4999,7 +5006,7 @@ def main():
     for iso, p_E_adj in SUBSIDY_ADJ.items():
         if iso not in adj_costs:
             continue
-        row = next(r for r in cal if r["iso3"] == iso)
+        row = iso2row[iso]
         p_E_orig = float(row["p_E_usd_kwh"])
         pue = float(row["pue"])
         delta_elec = pue * GAMMA * (p_E_adj - p_E_orig)
@@ -5016,38 +5023,57 @@ def main():
             "fiscal_transfer_100mw": fiscal_transfer_100mw,
         }
 
-    adj_ranked = sorted(adj_costs.items(), key=lambda x: x[1])
-    adj_rank_map = {iso: rank for rank, (iso, _) in enumerate(adj_ranked, 1)}
+    adj_isos = np.array(list(adj_costs))
+    adj_costs_arr = np.fromiter(adj_costs.values(), dtype=np.float64, count=len(adj_costs))
+    adj_order = np.argsort(adj_costs_arr, kind='stable')
+    adj_ranked_isos = adj_isos[adj_order].tolist()
+    adj_ranked = list(zip(adj_ranked_isos, adj_costs_arr[adj_order].tolist(), strict=True))
+    adj_rank_map = {iso: rank for rank, iso in enumerate(adj_ranked_isos, 1)}
+
+    # Inference sourcing under cost-recovery costs; latency-driven choices
+    # feed both the regime-change count and the recomputed revenue shares
+    # Delivered inference cost P_I(j, k) = (1 + TAU * l_jk) * c_j for every
+    # buyer k (rows) and foreign supplier j (columns) in one broadcast; pairs
+    # without latency data are None -> NaN -> +inf. argmin keeps the first
+    # supplier among ties, and a foreign source must be strictly cheaper
+    # than domestic supply.
+    adj_dc = [iso for iso in dc_k if iso in adj_costs]
+    lat = np.array([[_get_latency(iso_j, iso_k) if iso_j != iso_k else None for iso_j in adj_costs]
+                    for iso_k in adj_dc], dtype=float).reshape(len(adj_dc), len(adj_costs))
+    P_I = (1 + TAU * lat) * adj_costs_arr
+    P_I[np.isnan(P_I)] = np.inf
+    best_j = P_I.argmin(axis=1).tolist()
+    adj_reg = {}
+    for row, iso_k in enumerate(adj_dc):
+        l_kk = _get_latency(iso_k, iso_k)
+        P_I_dom = (1 + TAU * (l_kk or 0)) * adj_costs[iso_k]
+        best_inf_cost = P_I_dom
+        best_inf_src = iso_k
+        cost_del = float(P_I[row, best_j[row]])
+        if cost_del < P_I_dom:
+            best_inf_cost = cost_del
+            best_inf_src = str(adj_isos[best_j[row]])
+        adj_reg[iso_k] = {
+            'best_inf_source': best_inf_src,
+            'best_inf_cost': f'{best_inf_cost:.4f}',
+            'P_I_domestic': f'{P_I_dom:.4f}',
+        }
 
     # Count regime changes under adjusted costs
     regime_changes = 0
+    adj_cheapest_train = adj_ranked[0][0]
+    adj_train_cost = adj_costs[adj_cheapest_train]
     for iso_k in dc_k:
-        if iso_k not in reg:
+        r = reg.get(iso_k)
+        if r is None:
             continue
-        orig_regime = reg[iso_k]["regime"]
-        # Recompute regime under adjusted costs
-        c_k_adj = adj_costs.get(iso_k, costs_dict.get(iso_k))
-        if c_k_adj is None:
+        orig_regime = r["regime"]
+        r_adj = adj_reg.get(iso_k)
+        if r_adj is None:
             continue
-        adj_cheapest_train = adj_ranked[0][0]
-        adj_train_cost = adj_costs[adj_cheapest_train]
-        is_dom_train = (adj_train_cost >= c_k_adj)
-        # Inference: find best source under adjusted costs
-        l_kk = _get_latency(iso_k, iso_k)
-        P_I_dom = (1 + TAU * l_kk) * c_k_adj if l_kk is not None else c_k_adj
-        best_inf_adj = P_I_dom
-        best_inf_src = iso_k
-        for j, c_j in adj_costs.items():
-            if j == iso_k:
-                continue
-            l_jk = _get_latency(j, iso_k)
-            if l_jk is None:
-                continue
-            cost = (1 + TAU * l_jk) * c_j
-            if cost < best_inf_adj:
-                best_inf_adj = cost
-                best_inf_src = j
-        is_dom_inf = (best_inf_src == iso_k)
+        is_dom_train = (adj_train_cost >= adj_costs[iso_k])
+        # Inference sourcing under adjusted costs (computed once in adj_reg)
+        is_dom_inf = (r_adj['best_inf_source'] == iso_k)
         if is_dom_train and is_dom_inf:
             new_regime = "full domestic"
         elif is_dom_train:
@@ -5063,7 +5089,7 @@ def main():
     # Top 5 adjusted ranking
     adj_top5 = []
     for iso, c in adj_ranked[:5]:
-        co = next((r["country"] for r in cal if r["iso3"] == iso), iso)
+        co = iso_country.get(iso, iso)
         adj_top5.append((iso, co, c))
 
     # Subsidy gap statistics
@@ -5072,8 +5098,7 @@ def main():
     max_gap_entry = adj_changes[max_gap_iso]
 
     demand_data["adj_top5"] = adj_top5
-    demand_data["adj_cheapest_name"] = next(
-        (r["country"] for r in cal if r["iso3"] == adj_cheapest), adj_cheapest)
+    demand_data["adj_cheapest_name"] = iso_country.get(adj_cheapest, adj_cheapest)
     demand_data["adj_rank_map"] = adj_rank_map
     demand_data["adj_costs"] = adj_costs
     demand_data["n_adjusted"] = len(adj_changes)
@@ -5108,9 +5133,9 @@ def main():
     costs_dict = adj_costs
 
     # Re-run capacity equilibrium on cost-recovery costs
-    (p_T_0, _, _, cap_hhi_0, mu_0, ls_0, n_exp_0
+    (p_T_0, _, cap_hhi_0, mu_0, ls_0, n_exp_0
      ) = solve_capacity_equilibrium(0.0, "\u03bb=0 cost-recovery")
-    (p_T_sov, _, _, cap_hhi_sov, _, _, n_exp_sov
+    (p_T_sov, _, cap_hhi_sov, _, _, n_exp_sov
      ) = solve_capacity_equilibrium(LAMBDA, f"\u03bb={LAMBDA} cost-recovery")
 
     demand_data["p_T"] = p_T_0
@@ -5122,59 +5147,61 @@ def main():
     demand_data["mu_j"] = mu_0
     demand_data["lambda_star"] = ls_0
 
-    # Recompute inference sourcing under cost-recovery costs
-    adj_reg = {}
-    for iso_k in dc_k:
-        c_k = adj_costs.get(iso_k)
+    # Recompute inference revenue shares, welfare, counterfactual and KGZ
+    # inference clients in a single pass over demand centers
+    adj_min_cost = adj_ranked[0][1]
+    adj_thr_10 = 1.10 * adj_min_cost
+    adj_thr_20 = 1.20 * adj_min_cost
+    adj_inf_revenue = defaultdict(float)
+    adj_welfare_train = 0
+    adj_welfare_inf = 0
+    adj_weighted_avg = 0
+    adj_count_dom_10 = 0
+    adj_count_dom_20 = 0
+    adj_export_share_10 = 0
+    adj_export_share_20 = 0
+    adj_kgz_clients = []
+    # Cheapest foreign non-sanctioned supplier does not depend on the demand
+    # center except when the center is itself the cheapest supplier
+    best_src_ex = min((j for j in adj_costs if j not in sanctioned),
+                      key=adj_costs.__getitem__)
+    best_cost_ex = adj_costs[best_src_ex]
+    second_cost_ex = min(c for j, c in adj_costs.items()
+                         if j != best_src_ex and j not in sanctioned)
+    for iso in dc_k:
+        w = omega.get(iso, 0)
+        r = adj_reg.get(iso)
+        c_k = adj_costs.get(iso)
+        if r is not None:
+            src = r['best_inf_source']
+            adj_inf_revenue[src] += w
+            if c_k is not None:
+                min_foreign = second_cost_ex if iso == best_src_ex else best_cost_ex
+                adj_welfare_train += w * max(0, c_k - min_foreign)
+                best_inf = float(r["best_inf_cost"])
+                P_I_dom = float(r["P_I_domestic"])
+                adj_welfare_inf += w * max(0, P_I_dom - best_inf)
+            if src == "KGZ":
+                co = iso_country.get(iso, iso)
+                adj_kgz_clients.append((iso, co, w * 100))
         if c_k is None:
             continue
-        l_kk = _get_latency(iso_k, iso_k)
-        P_I_dom = (1 + TAU * (l_kk or 0)) * c_k
-        best_inf_cost = P_I_dom
-        best_inf_src = iso_k
-        for iso_j, c_j in adj_costs.items():
-            if iso_j == iso_k:
-                continue
-            l_jk = _get_latency(iso_j, iso_k)
-            if l_jk is None:
-                continue
-            cost_del = (1 + TAU * l_jk) * c_j
-            if cost_del < best_inf_cost:
-                best_inf_cost = cost_del
-                best_inf_src = iso_j
-        adj_reg[iso_k] = {
-            'best_inf_source': best_inf_src,
-            'best_inf_cost': f'{best_inf_cost:.4f}',
-            'P_I_domestic': f'{P_I_dom:.4f}',
-        }
+        adj_weighted_avg += w * c_k
+        if c_k <= adj_thr_10:
+            adj_count_dom_10 += 1
+        else:
+            adj_export_share_10 += w
+        if c_k <= adj_thr_20:
+            adj_count_dom_20 += 1
+        else:
+            adj_export_share_20 += w
 
-    # Recompute inference revenue shares
-    adj_inf_revenue = {}
-    for iso in dc_k:
-        if iso in adj_reg:
-            src = adj_reg[iso]['best_inf_source']
-            adj_inf_revenue[src] = adj_inf_revenue.get(src, 0) + omega.get(iso, 0)
+    adj_inf_revenue = dict(adj_inf_revenue)
     adj_hhi_i = sum(s**2 for s in adj_inf_revenue.values())
     demand_data["inf_revenue"] = adj_inf_revenue
     demand_data["hhi_i"] = adj_hhi_i
 
-    # Recompute welfare
-    adj_welfare_train = 0
-    adj_welfare_inf = 0
-    for iso in dc_k:
-        if iso in adj_reg and iso in adj_costs:
-            c_k = adj_costs[iso]
-            min_foreign = min(
-                c for i, c in adj_costs.items()
-                if i != iso and i not in sanctioned)
-            adj_welfare_train += omega.get(iso, 0) * max(0, c_k - min_foreign)
-            best_inf = float(adj_reg[iso]["best_inf_cost"])
-            P_I_dom = float(adj_reg[iso]["P_I_domestic"])
-            adj_welfare_inf += omega.get(iso, 0) * max(0, P_I_dom - best_inf)
     adj_welfare_total = adj_welfare_train + adj_welfare_inf
-    adj_weighted_avg = sum(
-        omega.get(iso, 0) * adj_costs[iso]
-        for iso in dc_k if iso in adj_costs)
     adj_welfare_pct = (adj_welfare_total / adj_weighted_avg * 100
                        if adj_weighted_avg > 0 else 0)
     demand_data["welfare_total"] = adj_welfare_total
@@ -5183,28 +5210,9 @@ def main():
     demand_data["welfare_inf"] = adj_welfare_inf
     demand_data["weighted_avg_cost"] = adj_weighted_avg
 
-    # Recompute counterfactual
-    adj_min_cost = min(adj_costs.values())
-    adj_count_dom_10 = sum(
-        1 for iso in dc_k
-        if iso in adj_costs and adj_costs[iso] <= 1.10 * adj_min_cost)
-    adj_count_dom_20 = sum(
-        1 for iso in dc_k
-        if iso in adj_costs and adj_costs[iso] <= 1.20 * adj_min_cost)
     demand_data["extra_dom"] = adj_count_dom_20 - adj_count_dom_10
-    demand_data["export_share_10"] = sum(
-        omega.get(iso, 0) for iso in dc_k
-        if iso in adj_costs and adj_costs[iso] > 1.10 * adj_min_cost)
-    demand_data["export_share_20"] = sum(
-        omega.get(iso, 0) for iso in dc_k
-        if iso in adj_costs and adj_costs[iso] > 1.20 * adj_min_cost)
-
-    # Recompute KGZ inference clients
-    adj_kgz_clients = []
-    for iso in dc_k:
-        if iso in adj_reg and adj_reg[iso]["best_inf_source"] == "KGZ":
-            co = next((r["country"] for r in cal if r["iso3"] == iso), iso)
-            adj_kgz_clients.append((iso, co, omega.get(iso, 0) * 100))
+    demand_data["export_share_10"] = adj_export_share_10
+    demand_data["export_share_20"] = adj_export_share_20
     demand_data["kgz_inf_clients"] = adj_kgz_clients
 
     # Store adj_reg and adj_costs for write functions
@@ -5215,14 +5223,14 @@ def main():
     print(f"  Cost-recovery inference HHI_I = {adj_hhi_i:.4f}")
     adj_inf_top5 = sorted(adj_inf_revenue.items(), key=lambda x: -x[1])[:5]
     for iso, share in adj_inf_top5:
-        co = next((r["country"] for r in cal if r["iso3"] == iso), iso)
+        co = iso_country.get(iso, iso)
         print(f"    {co}: {share * 100:.1f}%")
 
     # ═══════════════════════════════════════════════════════════════════════
     # SENSITIVITY ANALYSIS
     # ═══════════════════════════════════════════════════════════════════════
     print("\nRunning sensitivity analysis...")
-    sens_results = run_sensitivity(cal, omega, dc_k, k_bar, sanctioned)
+    sens_results = run_sensitivity(cost_arrs, omega, dc_k, k_bar, sanctioned)
     demand_data["sensitivity"] = sens_results
 
     # ═══════════════════════════════════════════════════════════════════════
@@ -5262,7 +5270,7 @@ def main():
     # Top 5 with names
     xi_top5 = []
     for iso, cost in xi_rank[:5]:
-        co = next((r["country"] for r in cal if r["iso3"] == iso), iso)
+        co = iso_country.get(iso, iso)
         xi_top5.append((co, cost))
 
     # Spearman rank correlation
@@ -5288,7 +5296,7 @@ def main():
     }
     demand_data["xi"] = xi
     # Country name map for figure labels
-    demand_data["iso_country"] = {r["iso3"]: r["country"] for r in cal}
+    demand_data["iso_country"] = iso_country
     print(f"  Reliability-adjusted top 5: {[f'{co} (${c:.2f})' for co, c in xi_top5]}")
     print(f"  Spearman rank corr: {spearman:.4f}, top-10 changes: {n_changed_top10}")
 
@@ -5304,36 +5312,32 @@ def main():
 
     hmap = {}
     for el in all_el:
-        if el.tag == qn('w:p'):
-            pPr = el.find(qn('w:pPr'))
-            if pPr is not None:
-                pS = pPr.find(qn('w:pStyle'))
-                if pS is not None and 'Heading' in pS.get(qn('w:val'), ''):
-                    ft = "".join(r.text or "" for r in el.findall(f'.//{qn("w:t")}'))
-                    if '1.2' in ft:
-                        hmap['1.2'] = el
-                    elif '1.1' in ft:
-                        hmap['1.1'] = el
-                    elif '1.' in ft and 'Model' in ft:
-                        hmap['1'] = el
-                    elif '2.' in ft and 'Comp' in ft:
-                        hmap['2'] = el
-                    elif '3.' in ft and 'Make' in ft:
-                        hmap['3'] = el
-                    elif '4.' in ft and 'Calib' in ft:
-                        hmap['4'] = el
-                    elif '5.' in ft and 'Conc' in ft:
-                        hmap['5'] = el
-                    elif ft.strip() == 'References':
-                        hmap['refs'] = el
-                    elif ft.strip() == 'Abstract':
-                        hmap['abs'] = el
+        if el.tag != _Q_W_P:
+            continue
+        pPr = el.find(_Q_W_PPR)
+        if pPr is None:
+            continue
+        pS = pPr.find(_Q_W_PSTYLE)
+        if pS is None or not pS.get(_Q_W_VAL, '').startswith('Heading'):
+            continue
+        ft = "".join(r.text or "" for r in el.findall(_Q_W_T_ALL))
+        m = _HEADING_NUM_RE.match(ft)
+        if m:
+            word = _HEADING_KEYS.get(m.group(1))
+            if word is not None and word in m.group(2):
+                hmap[m.group(1)] = el
+        elif ft.strip() in _HEADING_NAMED:
+            hmap[_HEADING_NAMED[ft.strip()]] = el
 
     # ═══════════════════════════════════════════════════════════════════════
     # STEPS
     # ═══════════════════════════════════════════════════════════════════════
+    # Order matters: writers anchor on headings created or renumbered by
+    # earlier steps (hmap is mutated in place), and footnote ids and
+    # bookmark ids are shared module-level counters. Section prose is cheap
+    # to build; the expensive step is table construction (add_table).
 
-    title_el, author_el, ver_el, abs_text_el, kw_el = write_title_and_abstract(doc, body, all_el, hmap)
+    title_el, author_el, ver_el, abs_text_el, kw_el = write_title_and_abstract(doc, body, all_el, hmap, build_time)
     write_introduction(doc, body, hmap)
     write_literature(doc, body, hmap)
     write_production_technology(doc, body, hmap)